@@ -551,17 +551,14 @@ def get_dashboard_stats(local_paths, config):
     stats['level'] = xp_data.get('level', 1)
     stats['total_xp'] = xp_data.get('total_xp', 0)
     
-    # Calculate XP for next level
+    # Calculate XP for next level (XP_LEVELS is ordered, level N at index N-1)
     from .gamification import XP_LEVELS
-    if stats['level'] < len(XP_LEVELS):
-        next_level_info = next((l for l in XP_LEVELS if l['level'] == stats['level'] + 1), None)
-        if next_level_info:
-            stats['xp_needed'] = next_level_info['threshold'] - stats['total_xp']
-            current_level_threshold = next((l for l in XP_LEVELS if l['level'] == stats['level']), {})['threshold']
-            stats['xp_progress'] = stats['total_xp'] - current_level_threshold
-            stats['xp_total_needed'] = next_level_info['threshold'] - current_level_threshold
-        else:
-            stats['xp_needed'] = 0
+    if 1 <= stats['level'] < len(XP_LEVELS):
+        current_level_threshold = XP_LEVELS[stats['level'] - 1]['threshold']
+        next_level_threshold = XP_LEVELS[stats['level']]['threshold']
+        stats['xp_needed'] = next_level_threshold - stats['total_xp']
+        stats['xp_progress'] = stats['total_xp'] - current_level_threshold
+        stats['xp_total_needed'] = next_level_threshold - current_level_threshold
     else:
         stats['xp_needed'] = 0
         
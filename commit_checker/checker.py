@@ -2,7 +2,7 @@ import subprocess
 import os
 import requests
 import json
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 
 GITHUB_CACHE_FILE = os.path.expanduser("~/.commit_checker_cache/github_commits.json")
 CACHE_DURATION = 3600
@@ -238,10 +238,11 @@ def scan_repos(repo_folder):
                     
                     # Convert to a more readable format
                     if last_commit_date:
-                        commit_date = datetime.strptime(last_commit_date, "%Y-%m-%d")
-                        if commit_date.date() == datetime.now().date():
+                        commit_date = date.fromisoformat(last_commit_date)
+                        local_today = date.today()
+                        if commit_date == local_today:
                             last_commit_display = "Today"
-                        elif commit_date.date() == (datetime.now() - timedelta(days=1)).date():
+                        elif commit_date == local_today - timedelta(days=1):
                             last_commit_display = "Yesterday"
                         else:
                             last_commit_display = commit_date.strftime("%b %d")
@@ -365,10 +366,11 @@ def get_most_active_repo(repo_folder, timeframe="day"):
                         ).decode("utf-8").strip()
                         
                         if last_commit_date:
-                            commit_date = datetime.strptime(last_commit_date, "%Y-%m-%d")
-                            if commit_date.date() == datetime.now().date():
+                            commit_date = date.fromisoformat(last_commit_date)
+                            local_today = date.today()
+                            if commit_date == local_today:
                                 last_activity = "Today"
-                            elif commit_date.date() == (datetime.now() - timedelta(days=1)).date():
+                            elif commit_date == local_today - timedelta(days=1):
                                 last_activity = "Yesterday"
                             else:
                                 last_activity = commit_date.strftime("%b %d")
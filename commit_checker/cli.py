@@ -1365,10 +1365,13 @@ def main():
         
         if gamification_data["achievements"]:
             output("🏆 New achievements unlocked:")
+            from .gamification import ACHIEVEMENTS
             for achievement_id in gamification_data["achievements"]:
-                from .gamification import ACHIEVEMENTS
-                achievement = ACHIEVEMENTS.get(achievement_id, {})
-                output(f"   {achievement.get('emoji', '🏆')} {achievement.get('name', achievement_id)}")
+                achievement = ACHIEVEMENTS.get(achievement_id)
+                if achievement:
+                    output(f"   {achievement['emoji']} {achievement['name']}")
+                else:
+                    output(f"   🏆 {achievement_id}")
         
         if gamification_data["current_streak"] > 0:
             output(f"🔥 Current streak: {gamification_data['current_streak']} days")
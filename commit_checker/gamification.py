@@ -1,15 +1,93 @@
+import io
 import os
+import copy
+import sys
+import re
 import json
+import math
+import bisect
 import subprocess
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+
+# Prefer a C JSON codec when one is installed; all variants read and write bytes.
+# _dumps writes compact JSON unless indent is set for hand-readable files.
+try:
+    import orjson
+
+    def _dumps(data, indent=False):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        def _dumps(data, indent=False):
+            return ujson.dumps(data, indent=2 if indent else 0, ensure_ascii=False).encode("utf-8")
+
+        _loads = ujson.loads
+    except ImportError:
+        def _dumps(data, indent=False):
+            if indent:
+                return json.dumps(data, indent=2).encode("utf-8")
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+        _loads = json.loads
 
 
 ACHIEVEMENTS_PATH = os.path.expanduser("~/.commit-checker/achievements.json")
 XP_PATH = os.path.expanduser("~/.commit-checker/xp.json")
+REPO_CACHE_PATH = os.path.expanduser("~/.commit-checker/repo_cache.json")
+
+# XP weights used when the config does not set xp_weights
+_DEFAULT_XP_WEIGHTS = MappingProxyType({
+    'insertions': 0.5,  # Reduced from 1.0
+    'deletions': 0.3,   # Reduced from 0.5
+    'files': 5.0,       # Bonus for touching multiple files
+    'projects': MappingProxyType({})
+})
+
+# One "git log --numstat" line: "<added>\t<deleted>\t<path>", "-" for binary files
+_NUMSTAT_RE = re.compile(r'(\d+|-)\t(\d+|-)\t')
+
+# analytics.get_language_stats, imported lazily by _get_language_stats
+_language_stats_func = None
+
+# Lines changed (insertions + deletions) in one commit that unlock big_diff
+_BIG_DIFF_LINES = 500
+
+# (config, settings) for the config last passed to _xp_settings
+_xp_settings_cache = (None, None)
+
+# Dependency, virtualenv and build trees never searched for repositories
+_SKIP_DIRS = frozenset({
+    "node_modules", "venv", ".venv", ".tox", ".nox", "__pycache__",
+    ".mypy_cache", ".pytest_cache", "site-packages", "target",
+})
+
+# Upper bound on concurrent per-repository git scans
+_MAX_GIT_WORKERS = 8
+
+# git is only read from here: skip optional index locks, force untranslated
+# output for parsing, and never let a scan kick off auto-gc
+_GIT_ENV_OVERRIDES = MappingProxyType({"GIT_OPTIONAL_LOCKS": "0", "LC_ALL": "C"})
+_GIT_OPTIONS = ("-c", "core.preloadIndex=true", "-c", "gc.auto=0")
+
+# Set once ensure_gamification_files has created the data directory and files
+_files_ensured = False
+
+# Contents of the data files before anything has been saved
+_DEFAULT_ACHIEVEMENTS = {"unlocked": [], "progress": {}}
+_DEFAULT_XP_DATA = {"total_xp": 0, "level": 1, "commits_tracked": 0}
 
 # Achievement definitions with ASCII art and rarity
-ACHIEVEMENTS = {
+_ACHIEVEMENT_DEFS = {
     "streak_3": {
         "name": "Getting Started",
         "description": "3-day commit streak",
@@ -421,6 +499,53 @@ ACHIEVEMENTS = {
     }
 }
 
+# Read-only public view. IDs and rarities are interned since they are
+# only ever used as lookup keys.
+for _achievement in _ACHIEVEMENT_DEFS.values():
+    _achievement['rarity'] = sys.intern(_achievement['rarity'])
+del _achievement
+ACHIEVEMENTS = MappingProxyType({sys.intern(aid): a for aid, a in _ACHIEVEMENT_DEFS.items()})
+
+# Rarity display order and gallery section headers
+_RARITY_ORDER = ("common", "rare", "epic", "legendary", "mythic")
+_RARITY_COLORS = {"common": "🟩", "rare": "🟦", "epic": "🟨", "legendary": "🟥", "mythic": "🟪"}
+_RARITY_HEADERS = MappingProxyType({
+    rarity: f"\n{_RARITY_COLORS[rarity]} {rarity.upper()} BADGES\n" for rarity in _RARITY_ORDER
+})
+
+# Compact gallery preview: first 3 ASCII art lines, indented and joined once at import
+_COMPACT_ASCII = MappingProxyType({
+    aid: "\n".join("   " + line for line in a['ascii'][:3]) for aid, a in ACHIEVEMENTS.items()
+})
+
+# (threshold, achievement_id) tiers; must stay in ascending threshold order
+_STREAK_MILESTONES = tuple((days, f"streak_{days}") for days in (3, 5, 7, 14, 30, 90, 100, 365))
+_COMMIT_MILESTONES = (
+    (1, "first_commit"),
+    (10, "commits_10"),
+    (100, "hundred_commits"),
+    (500, "commits_500"),
+    (1000, "thousand_commits"),
+    (5000, "commits_5000"),
+    (10000, "commits_10000"),
+)
+_TIL_MILESTONES = (
+    (1, "first_til"),
+    (10, "til_10"),
+    (100, "til_100"),
+    (1000, "til_1000"),
+    (10000, "til_10000"),
+)
+_AI_MILESTONES = (
+    (1, "ai_curious"),
+    (10, "ai_student"),
+    (50, "ai_apprentice"),
+    (100, "ai_master"),
+)
+
+# git log windows (in days) for streak scans; the last one caps the streak
+_STREAK_WINDOWS = (30, 90)
+
 # XP Level thresholds - MUCH HARDER (v0.8.5 overhaul)
 XP_LEVELS = [
     {"level": 1, "threshold": 0, "title": "Novice Coder"},
@@ -525,149 +650,379 @@ XP_LEVELS = [
     {"level": 100, "threshold": 214100000, "title": "Diamond Scripter"},
 ]
 
+# Parallel level tuples (sorted by threshold) for bisect/index lookups
+_THRESHOLDS = tuple(l['threshold'] for l in XP_LEVELS)
+_LEVEL_NUMS = tuple(l['level'] for l in XP_LEVELS)
+_TITLES = tuple(l['title'] for l in XP_LEVELS)
+_MAX_LEVEL = len(XP_LEVELS)
+
+
+def _git_env():
+    """Current environment plus the read-only git overrides"""
+    return {**os.environ, **_GIT_ENV_OVERRIDES}
+
+
+def _git(repo_path, args):
+    """Run a read-only git command in repo_path and return its stripped stdout ("" on failure)"""
+    result = subprocess.run(
+        ["git", "-C", repo_path, *_GIT_OPTIONS, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=_git_env(),
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        check=False
+    )
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _git_lines(repo_path, args):
+    """Yield non-empty stdout lines of a read-only git command as git produces them"""
+    with subprocess.Popen(
+        ["git", "-C", repo_path, *_GIT_OPTIONS, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=_git_env(),
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    ) as proc:
+        for line in proc.stdout:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def _atomic_write_json(path, data, indent=False):
+    """Write JSON to a temporary file in one write, then rename it over path"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        f = open(tmp_path, 'wb')
+    except FileNotFoundError:
+        # First write: create the data directory only when it is missing
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(tmp_path, 'wb')
+    with f:
+        f.write(_dumps(data, indent))
+    os.replace(tmp_path, path)
+
+
+def _load_json(path, default):
+    """Read a JSON data file, or return a fresh copy of default if it does not exist yet"""
+    try:
+        with open(path, 'rb') as f:
+            return _loads(f.read())
+    except FileNotFoundError:
+        return copy.deepcopy(default)
+
 
 def ensure_gamification_files():
-    """Ensure gamification files exist"""
+    """Ensure gamification files exist (checked once per process)"""
+    global _files_ensured
+    if _files_ensured:
+        return
+    
     os.makedirs(os.path.dirname(ACHIEVEMENTS_PATH), exist_ok=True)
     
-    if not os.path.exists(ACHIEVEMENTS_PATH):
-        with open(ACHIEVEMENTS_PATH, 'w') as f:
-            json.dump({"unlocked": [], "progress": {}}, f, indent=2)
+    # Exclusive create: existing files are left alone without a separate exists() check
+    for path, default, indent in ((ACHIEVEMENTS_PATH, _DEFAULT_ACHIEVEMENTS, True),
+                                  (XP_PATH, _DEFAULT_XP_DATA, False)):
+        try:
+            with open(path, 'xb') as f:
+                f.write(_dumps(default, indent))
+        except FileExistsError:
+            pass
     
-    if not os.path.exists(XP_PATH):
-        with open(XP_PATH, 'w') as f:
-            json.dump({"total_xp": 0, "level": 1, "commits_tracked": 0}, f, indent=2)
+    _files_ensured = True
 
 
 def load_achievements():
     """Load achievements data"""
-    ensure_gamification_files()
-    with open(ACHIEVEMENTS_PATH, 'r') as f:
-        return json.load(f)
+    return _load_json(ACHIEVEMENTS_PATH, _DEFAULT_ACHIEVEMENTS)
 
 
 def save_achievements(data):
-    """Save achievements data"""
-    ensure_gamification_files()
-    with open(ACHIEVEMENTS_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    """Save achievements data (indented, the file is meant to be readable)"""
+    _atomic_write_json(ACHIEVEMENTS_PATH, data, indent=True)
 
 
 def load_xp_data():
     """Load XP data"""
-    ensure_gamification_files()
-    with open(XP_PATH, 'r') as f:
-        return json.load(f)
+    data = _load_json(XP_PATH, _DEFAULT_XP_DATA)
+    
+    # One-shot migration: older files store the last commit day as ISO text
+    legacy_date = data.pop('last_commit_date', None)
+    if legacy_date and 'last_commit_ordinal' not in data:
+        try:
+            data['last_commit_ordinal'] = date.fromisoformat(legacy_date).toordinal()
+        except (TypeError, ValueError):
+            pass
+    
+    return data
 
 
 def save_xp_data(data):
     """Save XP data"""
-    ensure_gamification_files()
-    with open(XP_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    _atomic_write_json(XP_PATH, data)
 
 
-def calculate_commit_xp(repo_path, commit_hash, config):
-    """Calculate XP for a specific commit based on diff stats with anti-inflation measures"""
-    try:
-        # Get diff stats for the commit
-        diff_output = subprocess.check_output([
-            "git", "--git-dir", os.path.join(repo_path, ".git"), 
-            "--work-tree", repo_path,
-            "show", "--stat", "--format=", commit_hash
-        ], stderr=subprocess.DEVNULL).decode("utf-8").strip()
+class GamificationState:
+    """Achievements and XP data held in memory and written back once by flush()
+    
+    Each file is read on first access. Unlocked IDs are kept in a dict used
+    as an ordered set, so the file's list stays in unlock order. Mutations
+    only mark the data dirty; nothing touches disk until flush(), which also
+    runs when the state is used as a context manager.
+    """
+    
+    def __init__(self):
+        self._achievements = None
+        self._unlocked = None
+        self._xp = None
+        self._dirty_achievements = False
+        self._dirty_xp = False
+    
+    @property
+    def achievements(self):
+        if self._achievements is None:
+            self._achievements = load_achievements()
+            self._unlocked = dict.fromkeys(self._achievements.get('unlocked', []))
+        return self._achievements
+    
+    @property
+    def unlocked(self):
+        if self._unlocked is None:
+            self.achievements
+        return self._unlocked
+    
+    @property
+    def xp(self):
+        if self._xp is None:
+            self._xp = load_xp_data()
+        return self._xp
+    
+    def unlock(self, achievement_id):
+        """Unlock an achievement in memory, returning True if it was newly unlocked"""
+        return bool(self.unlock_many((achievement_id,)))
+    
+    def unlock_many(self, achievement_ids):
+        """Unlock several achievements in memory, returning the newly unlocked IDs"""
+        candidates = [aid for aid in dict.fromkeys(achievement_ids) if aid in ACHIEVEMENTS]
+        if not candidates:
+            return []
         
-        if not diff_output:
-            return get_base_commit_xp(config)
+        unlocked = self.unlocked
+        new_ids = [aid for aid in candidates if aid not in unlocked]
         
-        # Parse insertions and deletions
-        insertions = deletions = files_changed = 0
-        for line in diff_output.split('\n'):
-            if 'file' in line and 'changed' in line:
-                # Parse summary line: "X files changed, Y insertions(+), Z deletions(-)"
-                parts = line.split(',')
-                for part in parts:
-                    if 'insertion' in part:
-                        nums = [int(s) for s in part.split() if s.isdigit()]
-                        if nums:
-                            insertions = nums[0]
-                    elif 'deletion' in part:
-                        nums = [int(s) for s in part.split() if s.isdigit()]
-                        if nums:
-                            deletions = nums[0]
-                    elif 'changed' in part:
-                        nums = [int(s) for s in part.split() if s.isdigit()]
-                        if nums:
-                            files_changed = nums[0]
+        if new_ids:
+            unlocked.update(dict.fromkeys(new_ids))
+            self._dirty_achievements = True
+        return new_ids
+    
+    def add_xp(self, amount):
+        """Add XP for a tracked commit, returning (level_up, new_level)"""
+        xp_data = self.xp
+        old_level = xp_data['level']
         
-        # Get repo name and current level for scaling
-        repo_name = os.path.basename(repo_path)
-        xp_data = load_xp_data()
-        current_level = xp_data.get('level', 1)
+        xp_data['total_xp'] += amount
+        xp_data['commits_tracked'] += 1
+        self._dirty_xp = True
         
-        # Load XP weights from config
-        xp_weights = config.get('xp_weights', {
-            'insertions': 0.5,  # Reduced from 1.0
-            'deletions': 0.3,   # Reduced from 0.5
-            'files': 5.0,       # Bonus for touching multiple files
-            'projects': {}
-        })
+        new_level = get_level_from_xp(xp_data['total_xp'])
+        if new_level > old_level:
+            xp_data['level'] = new_level
+            return True, new_level
+        return False, new_level
+    
+    def mark_daily_bonus(self, today):
+        """Record a commit on today's date, returning True if it is the first one"""
+        today_ordinal = today.toordinal()
+        if self.xp.get('last_commit_ordinal') == today_ordinal:
+            return False
+        self.xp['last_commit_ordinal'] = today_ordinal
+        self._dirty_xp = True
+        return True
+    
+    def flush(self):
+        """Write any modified data back to disk"""
+        if self._dirty_achievements:
+            self._achievements['unlocked'] = list(self._unlocked)
+            save_achievements(self._achievements)
+            self._dirty_achievements = False
+        if self._dirty_xp:
+            save_xp_data(self._xp)
+            self._dirty_xp = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+
+@contextmanager
+def _use_state(state):
+    """Yield the caller's state, or a temporary one flushed on exit"""
+    if state is not None:
+        yield state
+    else:
+        with GamificationState() as temp_state:
+            yield temp_state
+
+
+def _iter_commits_with_stats(repo_root):
+    """Yield (hash, insertions, deletions, files_changed) for today's commits from a single git log"""
+    commit_hash = None
+    insertions = deletions = files_changed = 0
+    
+    for line in _git_lines(repo_root, ["log", "--since=midnight", "--numstat", "--format=commit:%H"]):
+        if line.startswith("commit:"):
+            if commit_hash is not None:
+                yield commit_hash, insertions, deletions, files_changed
+            commit_hash = line[7:]
+            insertions = deletions = files_changed = 0
+            continue
+        
+        match = _NUMSTAT_RE.match(line)
+        if not match:
+            continue
+        
+        added, deleted = match.groups()
+        if added != "-":
+            insertions += int(added)
+        if deleted != "-":
+            deletions += int(deleted)
+        files_changed += 1
+    
+    if commit_hash is not None:
+        yield commit_hash, insertions, deletions, files_changed
+
+
+def _head_moved_since(root, timestamp):
+    """Whether the HEAD reflog of a repository was written at or after timestamp
+    
+    Every commit, merge, pull or reset appends to .git/logs/HEAD, so an older
+    mtime means nothing can have been committed since. Missing reflogs count
+    as moved so the repository is still scanned.
+    """
+    try:
+        return os.stat(os.path.join(root, ".git", "logs", "HEAD")).st_mtime >= timestamp
+    except OSError:
+        return True
+
+
+def _scan_repo_today(root, midnight=None):
+    """Return today's commit stats for one repository (() if idle or git fails)"""
+    # Idle repositories cost one stat instead of a git process
+    if midnight is not None and not _head_moved_since(root, midnight):
+        return ()
+    try:
+        return tuple(_iter_commits_with_stats(root))
+    except Exception:
+        return ()
+
+
+def _commit_xp(insertions, deletions, files_changed, settings, project_multiplier, current_level):
+    """Score one commit's diff stats with anti-inflation measures (no config, git or state access)"""
+    base_commit_xp, w_insertions, w_deletions, w_files, _ = settings
+    try:
+        # A zero project multiplier always floors to the base reward
+        if project_multiplier == 0:
+            return base_commit_xp
         
         # Calculate base XP with diminishing returns
         base_xp = (
-            insertions * xp_weights.get('insertions', 0.5) + 
-            deletions * xp_weights.get('deletions', 0.3) +
-            files_changed * xp_weights.get('files', 5.0)
+            insertions * w_insertions + 
+            deletions * w_deletions +
+            files_changed * w_files
         )
         
         # Apply logarithmic scaling to prevent inflation
         if base_xp > 0:
-            import math
             scaled_xp = math.log(1 + base_xp) * (1 + math.log(1 + base_xp) / 5) * 10  # Logarithmic scaling
         else:
-            scaled_xp = get_base_commit_xp(config)
+            scaled_xp = base_commit_xp
         
         # Apply level-based diminishing returns
         level_penalty = 1.0 / (1.0 + (current_level - 1) * 0.1)
         scaled_xp *= level_penalty
         
         # Apply project multiplier
-        project_multiplier = xp_weights.get('projects', {}).get(repo_name, 1.0)
         final_xp = int(scaled_xp * project_multiplier)
         
         # Cap maximum XP per commit based on level
         max_xp = 100 + (current_level * 10)
         final_xp = min(final_xp, max_xp)
         
-        # Check for big diff achievement
-        if insertions + deletions >= 500:
-            unlock_achievement("big_diff")
+        return max(base_commit_xp, final_xp)
         
-        return max(get_base_commit_xp(config), final_xp)
+    except Exception:
+        return base_commit_xp
+
+
+def calculate_commit_xp(repo_path, commit_stats, config, state=None, current_level=None):
+    """Calculate XP for a commit from its (hash, insertions, deletions, files_changed) stats with anti-inflation measures"""
+    try:
+        # Load XP weights from config
+        settings = _xp_settings(config)
+        project_multiplier = settings[4].get(os.path.basename(repo_path), 1.0)
+        _, insertions, deletions, files_changed = commit_stats
+        
+        if project_multiplier != 0:
+            with _use_state(state) as state:
+                # Get current level for scaling unless the caller already has it
+                if current_level is None:
+                    current_level = state.xp.get('level', 1)
+                
+                # Check for big diff achievement
+                if insertions + deletions >= _BIG_DIFF_LINES:
+                    state.unlock("big_diff")
+        
+        return _commit_xp(insertions, deletions, files_changed, settings, project_multiplier, current_level)
         
     except Exception:
         return get_base_commit_xp(config)
 
 
+def _xp_settings(config):
+    """Return (base_commit_xp, w_insertions, w_deletions, w_files, project_weights) for config
+    
+    The result for the last config object seen is reused, since one config
+    is passed unchanged to every commit of a run.
+    """
+    global _xp_settings_cache
+    cached_config, settings = _xp_settings_cache
+    if cached_config is config:
+        return settings
+    
+    xp_weights = config.get('xp_weights') or _DEFAULT_XP_WEIGHTS
+    settings = (
+        config.get('base_commit_xp', 3),  # Default 3 XP per commit
+        xp_weights.get('insertions', 0.5),
+        xp_weights.get('deletions', 0.3),
+        xp_weights.get('files', 5.0),
+        xp_weights.get('projects', {}),
+    )
+    _xp_settings_cache = (config, settings)
+    return settings
+
+
 def get_base_commit_xp(config):
     """Get base XP for any commit (minimum reward)"""
-    return config.get('base_commit_xp', 3)  # Default 3 XP per commit
+    return _xp_settings(config)[0]
 
 
-def get_daily_bonus_xp(config):
+def get_daily_bonus_xp(config, state=None):
     """Calculate bonus XP for first commit of the day"""
     from datetime import datetime
     today = datetime.now().date()
     
     # Check if this is the first commit today
-    xp_data = load_xp_data()
-    last_commit_date = xp_data.get('last_commit_date')
-    
-    if last_commit_date != today.isoformat():
-        # First commit today - bonus XP!
-        xp_data['last_commit_date'] = today.isoformat()
-        save_xp_data(xp_data)
-        return config.get('daily_bonus_xp', 10)  # Default 10 bonus XP
+    with _use_state(state) as state:
+        if state.mark_daily_bonus(today):
+            # First commit today - bonus XP!
+            return config.get('daily_bonus_xp', 10)  # Default 10 bonus XP
     
     return 0
 
@@ -693,101 +1048,67 @@ def get_streak_bonus_xp(streak_days):
     return streak_days * 0.1
 
 
-def add_xp(amount, commit_info=None):
-    """Add XP and check for level up"""
-    xp_data = load_xp_data()
-    old_level = xp_data['level']
-    
-    xp_data['total_xp'] += amount
-    xp_data['commits_tracked'] += 1
+def add_xp(amount, commit_info=None, state=None):
+    """Add XP and check for level up, returning (level_up, new_level)
     
-    # Check for level up
-    new_level = get_level_from_xp(xp_data['total_xp'])
-    if new_level > old_level:
-        xp_data['level'] = new_level
-        save_xp_data(xp_data)
-        return True, new_level  # Level up occurred
-    
-    save_xp_data(xp_data)
-    return False, new_level  # No level up
+    With a state the change is only written by state.flush(); without one a
+    temporary state is used and xp.json is saved before returning.
+    """
+    with _use_state(state) as state:
+        return state.add_xp(amount)
 
 
+@lru_cache(maxsize=512)
 def get_level_from_xp(total_xp):
     """Get level from total XP"""
-    for i in range(len(XP_LEVELS) - 1, -1, -1):
-        if total_xp >= XP_LEVELS[i]['threshold']:
-            return XP_LEVELS[i]['level']
-    return 1
+    index = bisect.bisect_right(_THRESHOLDS, total_xp)
+    return _LEVEL_NUMS[index - 1] if index else 1
 
 
+@lru_cache(maxsize=512)
 def get_xp_for_next_level(current_xp, current_level):
     """Get XP needed for next level"""
-    if current_level >= len(XP_LEVELS):
+    if current_level >= _MAX_LEVEL:
         return 0  # Max level
     
-    next_threshold = XP_LEVELS[current_level]['threshold']
+    next_threshold = _THRESHOLDS[current_level]
     return max(0, next_threshold - current_xp)
 
 
-def unlock_achievement(achievement_id):
+def unlock_achievements(achievement_ids, state=None):
+    """Unlock several achievements with a single save, returning the newly unlocked IDs"""
+    with _use_state(state) as state:
+        return state.unlock_many(achievement_ids)
+
+
+def unlock_achievement(achievement_id, state=None):
     """Unlock an achievement"""
-    achievements = load_achievements()
+    with _use_state(state) as state:
+        return state.unlock(achievement_id)
+
+
+def _reached_milestones(milestones, value):
+    """List the achievement IDs of every (threshold, achievement_id) tier reached by value
     
-    if achievement_id not in achievements['unlocked'] and achievement_id in ACHIEVEMENTS:
-        achievements['unlocked'].append(achievement_id)
-        achievements['unlocked'].sort()  # Keep sorted
-        save_achievements(achievements)
-        return True
-    return False
+    Milestone tables are in ascending threshold order, so the scan stops at
+    the first tier value has not reached.
+    """
+    reached = []
+    for threshold, aid in milestones:
+        if value < threshold:
+            break
+        reached.append(aid)
+    return reached
 
 
-def check_streak_achievements(streak_days):
+def check_streak_achievements(streak_days, state=None):
     """Check and unlock streak-based achievements"""
-    achievements_unlocked = []
-    
-    milestones = [3, 5, 7, 14, 30, 90, 100, 365]
-    for milestone in milestones:
-        if streak_days >= milestone:
-            achievement_id = f"streak_{milestone}"
-            if unlock_achievement(achievement_id):
-                achievements_unlocked.append(achievement_id)
-    
-    return achievements_unlocked
+    return unlock_achievements(_reached_milestones(_STREAK_MILESTONES, streak_days), state)
 
 
-def check_total_commits_achievements(total_commits):
+def check_total_commits_achievements(total_commits, state=None):
     """Check achievements based on total commits"""
-    achievements_unlocked = []
-    
-    if total_commits >= 1:
-        if unlock_achievement("first_commit"):
-            achievements_unlocked.append("first_commit")
-    
-    if total_commits >= 10:
-        if unlock_achievement("commits_10"):
-            achievements_unlocked.append("commits_10")
-    
-    if total_commits >= 100:
-        if unlock_achievement("hundred_commits"):
-            achievements_unlocked.append("hundred_commits")
-    
-    if total_commits >= 500:
-        if unlock_achievement("commits_500"):
-            achievements_unlocked.append("commits_500")
-    
-    if total_commits >= 1000:
-        if unlock_achievement("thousand_commits"):
-            achievements_unlocked.append("thousand_commits")
-    
-    if total_commits >= 5000:
-        if unlock_achievement("commits_5000"):
-            achievements_unlocked.append("commits_5000")
-    
-    if total_commits >= 10000:
-        if unlock_achievement("commits_10000"):
-            achievements_unlocked.append("commits_10000")
-    
-    return achievements_unlocked
+    return unlock_achievements(_reached_milestones(_COMMIT_MILESTONES, total_commits), state)
 
 
 def check_streak_milestone(streak_days, config):
@@ -806,32 +1127,32 @@ def check_streak_milestone(streak_days, config):
     return None
 
 
-def check_special_achievements(local_paths, config):
-    """Check for special/secret achievements"""
-    achievements_unlocked = []
+def _get_language_stats():
+    """Resolve analytics.get_language_stats on first use and remember it"""
+    global _language_stats_func
+    if _language_stats_func is None:
+        try:
+            from commit_checker.analytics import get_language_stats
+        except ImportError:
+            # Standalone mode
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            sys.path.insert(0, script_dir)
+            from analytics import get_language_stats
+        _language_stats_func = get_language_stats
+    return _language_stats_func
+
+
+def _special_candidates(language_count, now):
+    """List the special/secret achievement IDs earned for a language count at local time now"""
+    candidates = []
     
     # Check for midnight coder (commits between 2-4 AM)
-    from datetime import datetime
-    now = datetime.now()
     if 2 <= now.hour < 4:
-        if unlock_achievement("midnight_coder"):
-            achievements_unlocked.append("midnight_coder")
+        candidates.append("midnight_coder")
     
     # Check for polyglot achievement (5+ languages)
-    try:
-        from commit_checker.analytics import get_language_stats
-    except ImportError:
-        # Standalone mode
-        import sys
-        import os
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        sys.path.insert(0, script_dir)
-        from analytics import get_language_stats
-    
-    language_stats = get_language_stats(local_paths)
-    if len(language_stats) >= 5:
-        if unlock_achievement("polyglot"):
-            achievements_unlocked.append("polyglot")
+    if language_count >= 5:
+        candidates.append("polyglot")
     
     # Check for weekend warrior (this would need tracking weekend commit count)
     # For now, just check if it's weekend
@@ -840,111 +1161,185 @@ def check_special_achievements(local_paths, config):
         # you'd track weekend commits over time
         pass
     
-    return achievements_unlocked
+    return candidates
+
+
+def check_special_achievements(local_paths, config, state=None):
+    """Check for special/secret achievements"""
+    language_count = len(_get_language_stats()(local_paths))
+    return unlock_achievements(_special_candidates(language_count, datetime.now()), state)
+
+
+def evaluate_achievements(state, streak_days, total_commits, language_count, now=None):
+    """Check streak, total-commit and special achievements together with one unlock, returning the new IDs"""
+    if now is None:
+        now = datetime.now()
+    
+    candidates = _reached_milestones(_STREAK_MILESTONES, streak_days)
+    candidates += _reached_milestones(_COMMIT_MILESTONES, total_commits)
+    candidates += _special_candidates(language_count, now)
+    return state.unlock_many(candidates)
 
 
-def check_til_achievements(til_count):
+def check_til_achievements(til_count, state=None):
     """Check achievements based on TIL entries (v0.8.5)"""
-    achievements_unlocked = []
-    
-    if til_count >= 1:
-        if unlock_achievement("first_til"):
-            achievements_unlocked.append("first_til")
-    
-    if til_count >= 10:
-        if unlock_achievement("til_10"):
-            achievements_unlocked.append("til_10")
-    
-    if til_count >= 100:
-        if unlock_achievement("til_100"):
-            achievements_unlocked.append("til_100")
-    
-    if til_count >= 1000:
-        if unlock_achievement("til_1000"):
-            achievements_unlocked.append("til_1000")
-    
-    if til_count >= 10000:
-        if unlock_achievement("til_10000"):
-            achievements_unlocked.append("til_10000")
-    
-    return achievements_unlocked
+    return unlock_achievements(_reached_milestones(_TIL_MILESTONES, til_count), state)
 
 
-def check_ai_achievements(ai_usage_count, models_used_set):
+def check_ai_achievements(ai_usage_count, models_used_set, state=None):
     """Check achievements based on AI assistant usage (v0.8.5)
     
     Args:
         ai_usage_count: Total number of AI suggestions used
         models_used_set: Set of model names used (e.g., {'tensorflow', 'ollama'})
+        state: Optional GamificationState to unlock into without saving
     """
-    achievements_unlocked = []
+    candidates = _reached_milestones(_AI_MILESTONES, ai_usage_count)
     
-    if ai_usage_count >= 1:
-        if unlock_achievement("ai_curious"):
-            achievements_unlocked.append("ai_curious")
+    # Check if all 4 AI models have been used
+    all_models = {'tensorflow', 'ollama', 'together_ai', 'heuristic'}
+    if models_used_set >= all_models:  # Superset check
+        candidates.append("ai_polyglot")
     
-    if ai_usage_count >= 10:
-        if unlock_achievement("ai_student"):
-            achievements_unlocked.append("ai_student")
+    return unlock_achievements(candidates, state)
+
+
+def _repo_commit_dates(root, since):
+    """Return the set of YYYY-MM-DD commit dates in one repository since the given git date"""
+    try:
+        return set(_git_lines(root, ["log", f"--since={since}", "--format=%cs"]))
+    except Exception:
+        return set()
+
+
+def _scan_git_roots(local_paths, visited=None):
+    """Walk the configured paths and list the root of every git repository
     
-    if ai_usage_count >= 50:
-        if unlock_achievement("ai_apprentice"):
-            achievements_unlocked.append("ai_apprentice")
+    Uses os.scandir so only directory entries are inspected, stops descending
+    at each repository root and never enters _SKIP_DIRS. Non-repository
+    directories that were listed are appended to visited when it is given.
+    """
+    roots = []
+    for path in local_paths:
+        if not path or not os.path.isdir(path):
+            continue
+        
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            subdirs = []
+            is_repo = False
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.name == '.git':
+                            if entry.is_dir():
+                                is_repo = True
+                                break
+                        elif entry.name not in _SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+            
+            if is_repo:
+                roots.append(current)
+            else:
+                if visited is not None:
+                    visited.append(current)
+                # Reversed so directories are visited in listing order
+                pending.extend(reversed(subdirs))
+    return roots
+
+
+def _repo_cache_is_fresh(cache, paths):
+    """Whether a repo_cache.json scan still lists every repository under paths
     
-    if ai_usage_count >= 100:
-        if unlock_achievement("ai_master"):
-            achievements_unlocked.append("ai_master")
+    Today's commits are only ever scored today, so a scan from before local
+    midnight is discarded. Cloning or git init-ing a repository adds an entry
+    to a directory the scan listed, so any of those directories changing since
+    the scan started also invalidates it.
+    """
+    if cache.get("paths") != paths:
+        return False
+    scanned_at = cache["scanned_at"]
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    if scanned_at < midnight:
+        return False
+    for directory in cache["dirs"]:
+        try:
+            if os.stat(directory).st_mtime >= scanned_at:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _find_git_roots(local_paths):
+    """List the root of every git repository under the configured paths, cached in repo_cache.json"""
+    paths = [path for path in local_paths if path]
     
-    # Check if all 4 AI models have been used
-    all_models = {'tensorflow', 'ollama', 'together_ai', 'heuristic'}
-    if models_used_set >= all_models:  # Superset check
-        if unlock_achievement("ai_polyglot"):
-            achievements_unlocked.append("ai_polyglot")
+    # Reuse the last scan while no new repository can have appeared since
+    try:
+        with open(REPO_CACHE_PATH, 'rb') as f:
+            cache = _loads(f.read())
+        if _repo_cache_is_fresh(cache, paths):
+            return cache["roots"]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
     
-    return achievements_unlocked
+    # Back-dated a second so coarse filesystem timestamps can't hide a change
+    scanned_at = time.time() - 1.0
+    visited = []
+    roots = _scan_git_roots(paths, visited)
+    try:
+        _atomic_write_json(REPO_CACHE_PATH, {
+            "paths": paths, "scanned_at": scanned_at, "dirs": visited, "roots": roots
+        })
+    except OSError:
+        pass
+    return roots
 
 
-def get_current_streak(local_paths):
-    """Calculate current commit streak"""
+def _map_repos(func, roots):
+    """Run func on each repository root in a thread pool, preserving order
+    
+    git runs in a subprocess, so threads overlap the fork/exec and disk waits
+    of independent repositories. func must handle its own errors.
+    """
+    if not roots:
+        return []
+    with ThreadPoolExecutor(max_workers=min(_MAX_GIT_WORKERS, len(roots))) as executor:
+        return list(executor.map(func, roots))
+
+
+def get_current_streak(local_paths, git_roots=None):
+    """Calculate current commit streak across all repositories"""
     if not local_paths:
         return 0
     
-    streak = 0
+    if git_roots is None:
+        git_roots = _find_git_roots(local_paths)
+    if not git_roots:
+        return 0
+    
     current_date = datetime.now().date()
+    one_day = timedelta(days=1)
     
-    for path in local_paths:
-        if not path or not os.path.exists(path):
-            continue
-            
-        for root, dirs, files in os.walk(path):
-            if '.git' in dirs:
-                try:
-                    # Get all commit dates
-                    log_output = subprocess.check_output([
-                        "git", "--git-dir", os.path.join(root, ".git"),
-                        "--work-tree", root,
-                        "log", "--since=90 days ago", "--format=%cd", "--date=short"
-                    ], stderr=subprocess.DEVNULL).decode("utf-8").strip()
-                    
-                    if log_output:
-                        commit_dates = set()
-                        for line in log_output.split('\n'):
-                            if line.strip():
-                                commit_dates.add(datetime.strptime(line.strip(), "%Y-%m-%d").date())
-                        
-                        # Calculate streak
-                        temp_streak = 0
-                        check_date = current_date
-                        
-                        while check_date in commit_dates:
-                            temp_streak += 1
-                            check_date -= timedelta(days=1)
-                        
-                        streak = max(streak, temp_streak)
-                        
-                except Exception:
-                    continue
-                dirs.clear()
+    # A day counts if any repository has a commit on it; scan a short window
+    # first and widen it only if the streak fills the window
+    streak = 0
+    for window_days in _STREAK_WINDOWS:
+        since = f"{window_days} days ago"
+        commit_dates = set().union(*_map_repos(lambda root: _repo_commit_dates(root, since), git_roots))
+        
+        streak = 0
+        check_date = current_date
+        while check_date.isoformat() in commit_dates:
+            streak += 1
+            check_date -= one_day
+        
+        if streak < window_days:
+            break
     
     return streak
 
@@ -957,30 +1352,30 @@ def display_achievements():
     if not unlocked:
         return "🏆 No achievements unlocked yet. Start committing to earn your first badge!"
     
-    output = ["🏆 Achievement Gallery", "=" * 50, ""]
+    # Group by rarity in a single pass over the unlocked IDs
+    buckets = {rarity: [] for rarity in _RARITY_ORDER}
+    get_achievement = ACHIEVEMENTS.get
+    for achievement_id in set(unlocked):
+        achievement = get_achievement(achievement_id)
+        if achievement:
+            buckets[achievement['rarity']].append(achievement_id)
     
-    # Group by rarity
-    rarities = ["common", "rare", "epic", "legendary", "mythic"]
-    rarity_colors = {"common": "🟩", "rare": "🟦", "epic": "🟨", "legendary": "🟥", "mythic": "🟪"}
+    buf = io.StringIO()
+    buf.write("🏆 Achievement Gallery\n" + "=" * 50 + "\n")
     
-    for rarity in rarities:
-        rarity_achievements = [aid for aid in unlocked if ACHIEVEMENTS.get(aid, {}).get('rarity') == rarity]
+    for rarity in _RARITY_ORDER:
+        rarity_achievements = buckets[rarity]
         
         if rarity_achievements:
-            output.append(f"{rarity_colors[rarity]} {rarity.upper()} BADGES")
-            output.append("")
+            buf.write(_RARITY_HEADERS[rarity])
             
-            for achievement_id in rarity_achievements:
+            # Each bucket is small; sort it here rather than on every unlock
+            for achievement_id in sorted(rarity_achievements):
                 achievement = ACHIEVEMENTS[achievement_id]
-                output.append(f"   {achievement['emoji']} {achievement['name']}")
-                output.append(f"   {achievement['description']}")
-                
-                # Add ASCII art (compact version)
-                for line in achievement['ascii'][:3]:  # Show only first 3 lines for compactness
-                    output.append(f"   {line}")
-                output.append("")
+                buf.write(f"\n   {achievement['emoji']} {achievement['name']}\n   {achievement['description']}\n"
+                          f"{_COMPACT_ASCII[achievement_id]}\n")
     
-    return "\n".join(output)
+    return buf.getvalue()
 
 
 def display_xp_status():
@@ -989,26 +1384,15 @@ def display_xp_status():
     current_level = xp_data['level']
     current_xp = xp_data['total_xp']
     
-    # Get level info
-    level_info = None
-    for level in XP_LEVELS:
-        if level['level'] == current_level:
-            level_info = level
-            break
-    
-    if not level_info:
-        level_info = XP_LEVELS[-1]  # Max level
+    # Get level info (levels are numbered 1..N in XP_LEVELS order)
+    index = current_level - 1 if 0 < current_level <= _MAX_LEVEL else _MAX_LEVEL - 1  # Max level
+    threshold = _THRESHOLDS[index]
     
     # Calculate progress to next level
-    if current_level < len(XP_LEVELS):
-        next_level_info = next((l for l in XP_LEVELS if l['level'] == current_level + 1), None)
-        if next_level_info:
-            xp_needed = next_level_info['threshold'] - current_xp
-            progress = max(0, min(100, (current_xp - level_info['threshold']) / 
-                                  (next_level_info['threshold'] - level_info['threshold']) * 100))
-        else:
-            xp_needed = 0
-            progress = 100
+    if index + 1 < _MAX_LEVEL:
+        next_threshold = _THRESHOLDS[index + 1]
+        xp_needed = next_threshold - current_xp
+        progress = max(0, min(100, (current_xp - threshold) / (next_threshold - threshold) * 100))
     else:
         xp_needed = 0
         progress = 100
@@ -1018,20 +1402,16 @@ def display_xp_status():
     filled = int(progress / 100 * bar_length)
     progress_bar = "█" * filled + "░" * (bar_length - filled)
     
-    output = [
-        f"⚡ Level {current_level}: {level_info['title']}",
-        f"💫 Total XP: {current_xp:,}",
-        f"📊 Progress: [{progress_bar}] {progress:.1f}%"
-    ]
-    
     if xp_needed > 0:
-        output.append(f"🎯 Next Level: {xp_needed:,} XP needed")
+        next_line = f"🎯 Next Level: {xp_needed:,} XP needed"
     else:
-        output.append("🏆 MAX LEVEL REACHED!")
+        next_line = "🏆 MAX LEVEL REACHED!"
     
-    output.append(f"📈 Commits Tracked: {xp_data['commits_tracked']:,}")
-    
-    return "\n".join(output)
+    return (f"⚡ Level {current_level}: {_TITLES[index]}\n"
+            f"💫 Total XP: {current_xp:,}\n"
+            f"📊 Progress: [{progress_bar}] {progress:.1f}%\n"
+            f"{next_line}\n"
+            f"📈 Commits Tracked: {xp_data['commits_tracked']:,}")
 
 
 def process_commits_for_gamification(local_paths, config):
@@ -1039,62 +1419,55 @@ def process_commits_for_gamification(local_paths, config):
     if not local_paths:
         return {"xp_gained": 0, "achievements": [], "level_up": False}
     
-    total_xp_gained = 0
-    all_achievements = []
     level_up_occurred = False
-    total_commits_today = 0
-    first_commit_bonus_applied = False
     
-    for path in local_paths:
-        if not path or not os.path.exists(path):
-            continue
+    # One in-memory state for the whole run, written back once at the end
+    with GamificationState() as state:
+        current_level = state.xp.get('level', 1)
+        
+        # Discover repositories once and share them with the streak scan
+        git_roots = _find_git_roots(local_paths)
+        
+        # Workers only run git; commits are scored here, on the calling thread
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        repo_commits = _map_repos(lambda root: _scan_repo_today(root, midnight), git_roots)
+        
+        settings = _xp_settings(config)
+        project_weights = settings[4]
+        total_xp_gained = total_commits_today = 0
+        big_diff = False
+        for root, commits in zip(git_roots, repo_commits):
+            if not commits:
+                continue
             
-        for root, dirs, files in os.walk(path):
-            if '.git' in dirs:
-                try:
-                    # Get today's commits
-                    log_output = subprocess.check_output([
-                        "git", "--git-dir", os.path.join(root, ".git"),
-                        "--work-tree", root,
-                        "log", "--since=midnight", "--pretty=format:%H"
-                    ], stderr=subprocess.DEVNULL).decode("utf-8").strip()
-                    
-                    if log_output:
-                        commit_hashes = log_output.split('\n')
-                        total_commits_today += len(commit_hashes)
-                        
-                        for commit_hash in commit_hashes:
-                            xp = calculate_commit_xp(root, commit_hash, config)
-                            total_xp_gained += xp
-                            
-                            # Apply daily bonus XP for first commit only
-                            if not first_commit_bonus_applied:
-                                daily_bonus = get_daily_bonus_xp(config)
-                                weekend_bonus = get_weekend_bonus_xp()
-                                total_xp_gained += daily_bonus + weekend_bonus
-                                first_commit_bonus_applied = True
-                    
-                except Exception:
-                    continue
-                dirs.clear()
-    
-    # Add XP and check for level up
-    if total_xp_gained > 0:
-        level_up_occurred, new_level = add_xp(total_xp_gained)
-    
-    # Check streak achievements
-    current_streak = get_current_streak(local_paths)
-    streak_achievements = check_streak_achievements(current_streak)
-    all_achievements.extend(streak_achievements)
-    
-    # Check total commits achievements
-    xp_data = load_xp_data()
-    commit_achievements = check_total_commits_achievements(xp_data['commits_tracked'])
-    all_achievements.extend(commit_achievements)
-    
-    # Check special achievements
-    special_achievements = check_special_achievements(local_paths, config)
-    all_achievements.extend(special_achievements)
+            # One basename and multiplier lookup per repository, not per commit
+            project_multiplier = project_weights.get(os.path.basename(root), 1.0)
+            for _, insertions, deletions, files_changed in commits:
+                total_xp_gained += _commit_xp(
+                    insertions, deletions, files_changed, settings, project_multiplier, current_level
+                )
+                if project_multiplier != 0 and insertions + deletions >= _BIG_DIFF_LINES:
+                    big_diff = True
+            total_commits_today += len(commits)
+        
+        # Check for big diff achievement
+        if big_diff:
+            state.unlock("big_diff")
+        
+        # Apply daily bonus XP once if anything was committed today
+        if total_commits_today:
+            total_xp_gained += get_daily_bonus_xp(config, state) + get_weekend_bonus_xp()
+        
+        # Add XP and check for level up
+        if total_xp_gained > 0:
+            level_up_occurred, new_level = add_xp(total_xp_gained, state=state)
+        
+        # Check streak, total commits and special achievements in one pass
+        current_streak = get_current_streak(local_paths, git_roots)
+        language_count = len(_get_language_stats()(local_paths))
+        all_achievements = evaluate_achievements(
+            state, current_streak, state.xp['commits_tracked'], language_count
+        )
     
     return {
         "xp_gained": total_xp_gained,
@@ -5,10 +5,77 @@ Provides personalized recommendations based on historical patterns.
 """
 import os
 import re
+import copy
+import heapq
 import subprocess
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
+from operator import itemgetter
+
+
+# Conventional commit prefix, e.g. "feat:" or "fix(api):"
+_CONV_RE = re.compile(r'^([a-z]+)(\([^)]+\))?:\s+', re.IGNORECASE)
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Maps every ASCII non-word character to a space, so str.split() on an
+# ASCII message yields exactly the words _WORD_RE would find
+_NON_WORD_TABLE = str.maketrans({
+    c: ' ' for c in map(chr, range(128)) if not (c.isalnum() or c == '_')
+})
+_EMOJI_RE = re.compile(
+    r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF'
+    r'\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+'
+)
+
+# Emoji checked for when suggesting one for a new message
+_FACE_EMOJI_RE = re.compile(r'[\U0001F600-\U0001F64F]')
+
+# Common action words, in reporting order
+_ACTION_WORDS = ('add', 'fix', 'update', 'remove', 'refactor', 'implement',
+                 'create', 'delete', 'modify', 'improve', 'enhance', 'optimize')
+_ACTION_WORD_SET = frozenset(_ACTION_WORDS)
+_ACTION_RANK = {word: rank for rank, word in enumerate(_ACTION_WORDS)}
+
+# Common stop words left out of the keyword ranking
+_STOP_WORDS = frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with'])
+
+# First words that mark a message's tone
+_IMPERATIVE_FIRST = frozenset(['add', 'fix', 'update', 'remove', 'refactor',
+                               'implement', 'create', 'delete', 'improve'])
+_PAST_FIRST = frozenset(['added', 'fixed', 'updated', 'removed',
+                         'refactored', 'implemented', 'created', 'deleted'])
+
+# Fewer subjects than this say little about a style, so such histories
+# (and limits below it) get the default profile and no recommendations
+_MIN_COMMITS_TO_LEARN = 10
+
+# Profile used when there is no history to learn from; nothing was
+# analyzed, so unlike a learned profile it carries no analyzed_at
+_DEFAULT_PROFILE = {
+    "total_commits": 0,
+    "prefixes": {
+        "uses_conventional": False,
+        "common_prefixes": [],
+        "prefix_ratio": 0.0
+    },
+    "structure": {
+        "avg_length": 50,
+        "avg_words": 7,
+        "uses_capitalization": True
+    },
+    "keywords": {
+        "top_keywords": [],
+        "action_words": []
+    },
+    "tone": "imperative",
+    "emoji": {
+        "uses_emoji": False,
+        "emoji_ratio": 0.0
+    }
+}
 
 
 def run_git(command: List[str], cwd: str) -> Optional[str]:
@@ -25,6 +92,24 @@ def run_git(command: List[str], cwd: str) -> Optional[str]:
         return None
 
 
+def iter_git_lines(command: List[str], cwd: str) -> Iterator[str]:
+    """Run git command and yield its output lines as git produces them."""
+    try:
+        proc = subprocess.Popen(
+            ["git"] + command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+    except OSError:
+        return
+    
+    with proc:
+        for line in proc.stdout:
+            yield line.rstrip('\n')
+
+
 def analyze_commit_history(repo_path: str, limit: int = 100) -> Dict[str, Any]:
     """Analyze user's commit history to learn their style.
     
@@ -42,219 +127,221 @@ def analyze_commit_history(repo_path: str, limit: int = 100) -> Dict[str, Any]:
     Returns:
         Dict containing style profile
     """
-    # Get commit messages
-    log = run_git(
-        ["log", f"-{limit}", "--pretty=format:%s"],
-        repo_path
-    )
-    
-    if not log:
-        return get_default_profile()
+    # An unchanged HEAD means an unchanged history: reuse the last analysis
+    head = run_git(["rev-parse", "HEAD"], repo_path)
+    if head:
+        return copy.deepcopy(_analyze_at_head(repo_path, head, limit))
     
-    messages = [m.strip() for m in log.split('\n') if m.strip()]
-    
-    if not messages:
-        return get_default_profile()
+    return _analyze_log(repo_path, limit)
+
+
+@lru_cache(maxsize=16)
+def _analyze_at_head(repo_path: str, head: str, limit: int) -> Dict[str, Any]:
+    """Analyze history at a given HEAD, via the profile cache (memoized per process)."""
+    cached = load_profile_from_cache(repo_path, head, limit)
+    if cached:
+        return cached
+    
+    profile = _analyze_log(repo_path, limit)
+    if profile["total_commits"]:
+        save_profile_to_cache(repo_path, profile, head, limit)
+    return profile
+
+
+def _analyze_log(repo_path: str, limit: int) -> Dict[str, Any]:
+    """Stream git log and build the style profile from scratch."""
+    # Get commit messages (%s subjects are always a single line)
+    lines = iter_git_lines(["log", f"-{limit}", "--pretty=format:%s"], repo_path)
+    messages = (m for m in map(str.strip, lines) if m)
+    
+    # Too short a history to learn from: skip the analysis entirely
+    first = list(islice(messages, _MIN_COMMITS_TO_LEARN))
+    if len(first) < _MIN_COMMITS_TO_LEARN:
+        profile = copy.deepcopy(_DEFAULT_PROFILE)
+        profile["total_commits"] = len(first)
+        return profile
     
     # Analyze patterns
-    prefixes = analyze_prefixes(messages)
-    structure = analyze_structure(messages)
-    keywords = analyze_keywords(messages)
-    tone = analyze_tone(messages)
-    emoji_usage = analyze_emoji_usage(messages)
+    analysis = _analyze_all(chain(first, messages))
+    if analysis is None:
+        # A private copy: this is handed to callers that may modify it
+        return copy.deepcopy(_DEFAULT_PROFILE)
     
     return {
-        "total_commits": len(messages),
-        "prefixes": prefixes,
-        "structure": structure,
-        "keywords": keywords,
-        "tone": tone,
-        "emoji": emoji_usage,
+        "total_commits": analysis["total_commits"],
+        "prefixes": analysis["prefixes"],
+        "structure": analysis["structure"],
+        "keywords": analysis["keywords"],
+        "tone": analysis["tone"],
+        "emoji": analysis["emoji"],
         "analyzed_at": datetime.now().isoformat()
     }
 
 
 def get_default_profile() -> Dict[str, Any]:
     """Return default profile for repos with no history."""
+    return copy.deepcopy(_DEFAULT_PROFILE)
+
+
+def _analyze_all(messages: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Analyze prefixes, structure, keywords, tone and emoji in one pass.
+    
+    Each message is walked and tokenized once, so messages may be a stream;
+    returns None when it is empty. The per-aspect results match the
+    individual analyze_* functions, which are views over this one.
+    """
+    message_count = 0
+    prefix_counter = Counter()
+    conventional_count = 0
+    total_length = 0
+    total_words = 0
+    capitalized = 0
+    ends_with_period = 0
+    word_counter = Counter()
+    action_counter = Counter()
+    imperative_count = 0
+    past_tense_count = 0
+    continuous_count = 0
+    messages_with_emoji = 0
+    emoji_counter = Counter()
+    
+    for msg in messages:
+        message_count += 1
+        
+        # Prefixes
+        match = _CONV_RE.match(msg)
+        if match:
+            prefix_counter[match.group(1).lower()] += 1
+            conventional_count += 1
+        
+        # Structure
+        split_words = msg.split()
+        total_length += len(msg)
+        total_words += len(split_words)
+        if msg and msg[0].isupper():
+            capitalized += 1
+        if msg.endswith('.'):
+            ends_with_period += 1
+        
+        # Keywords and action words
+        lowered = msg.lower()
+        if lowered.isascii():
+            words = lowered.translate(_NON_WORD_TABLE).split()
+        else:
+            words = _WORD_RE.findall(lowered)
+        word_counter.update(words)
+        # Each action word counts once per message; hits are added in
+        # _ACTION_WORDS order so ties rank the same as a list scan would
+        found_actions = _ACTION_WORD_SET.intersection(words)
+        if found_actions:
+            action_counter.update(sorted(found_actions, key=_ACTION_RANK.__getitem__))
+        
+        # Tone, from the first word (the three classes never overlap)
+        first_word = split_words[0].lower() if split_words else ""
+        if first_word in _IMPERATIVE_FIRST:
+            imperative_count += 1
+        elif first_word in _PAST_FIRST:
+            past_tense_count += 1
+        elif first_word.endswith('ing'):
+            continuous_count += 1
+        
+        # Emoji
+        found_emoji = _EMOJI_RE.findall(msg)
+        if found_emoji:
+            messages_with_emoji += 1
+            emoji_counter.update(found_emoji)
+    
+    if not message_count:
+        return None
+    
+    # Top keywords, leaving out short and common stop words; nlargest keeps
+    # first-seen order on ties, the same as Counter.most_common
+    top_keywords = heapq.nlargest(
+        10,
+        ((w, c) for w, c in word_counter.items() if len(w) > 3 and w not in _STOP_WORDS),
+        key=itemgetter(1)
+    )
+    
+    # Determine dominant style
+    if imperative_count > past_tense_count and imperative_count > continuous_count:
+        tone = "imperative"
+    elif past_tense_count > continuous_count:
+        tone = "past_tense"
+    elif continuous_count > 0:
+        tone = "continuous"
+    else:
+        tone = "casual"
+    
     return {
-        "total_commits": 0,
+        "total_commits": message_count,
         "prefixes": {
-            "uses_conventional": False,
-            "common_prefixes": [],
-            "prefix_ratio": 0.0
+            "uses_conventional": conventional_count / message_count > 0.3,
+            "common_prefixes": [
+                {"prefix": prefix, "count": count}
+                for prefix, count in prefix_counter.most_common(5)
+            ],
+            "prefix_ratio": conventional_count / message_count
         },
         "structure": {
-            "avg_length": 50,
-            "avg_words": 7,
-            "uses_capitalization": True
+            "avg_length": int(total_length / message_count),
+            "avg_words": int(total_words / message_count),
+            "uses_capitalization": capitalized / message_count > 0.7,
+            "uses_periods": ends_with_period / message_count > 0.3
         },
         "keywords": {
-            "top_keywords": [],
-            "action_words": []
+            "top_keywords": [
+                {"word": word, "count": count}
+                for word, count in top_keywords
+            ],
+            "action_words": [
+                {"word": action, "count": count}
+                for action, count in action_counter.most_common(5)
+            ]
         },
-        "tone": "imperative",
+        "tone": tone,
         "emoji": {
-            "uses_emoji": False,
-            "emoji_ratio": 0.0
-        },
-        "analyzed_at": datetime.now().isoformat()
+            "uses_emoji": messages_with_emoji / message_count > 0.1,
+            "emoji_ratio": messages_with_emoji / message_count,
+            "common_emoji": [
+                {"emoji": emoji, "count": count}
+                for emoji, count in emoji_counter.most_common(5)
+            ]
+        }
     }
 
 
 def analyze_prefixes(messages: List[str]) -> Dict[str, Any]:
     """Analyze commit message prefixes (e.g., feat:, fix:, etc.)."""
-    conventional_pattern = re.compile(r'^([a-z]+)(\([^)]+\))?:\s+', re.IGNORECASE)
-    
-    prefixes = []
-    conventional_count = 0
-    
-    for msg in messages:
-        match = conventional_pattern.match(msg)
-        if match:
-            prefix = match.group(1).lower()
-            prefixes.append(prefix)
-            conventional_count += 1
-    
-    prefix_counter = Counter(prefixes)
-    common_prefixes = [
-        {"prefix": prefix, "count": count}
-        for prefix, count in prefix_counter.most_common(5)
-    ]
-    
-    return {
-        "uses_conventional": conventional_count / len(messages) > 0.3,
-        "common_prefixes": common_prefixes,
-        "prefix_ratio": conventional_count / len(messages)
-    }
+    return _analyze_all(messages)["prefixes"]
 
 
 def analyze_structure(messages: List[str]) -> Dict[str, Any]:
     """Analyze structural patterns in commit messages."""
-    lengths = [len(msg) for msg in messages]
-    word_counts = [len(msg.split()) for msg in messages]
-    
-    # Check capitalization
-    capitalized = sum(1 for msg in messages if msg[0].isupper()) if messages else 0
-    
-    # Check for ending punctuation
-    ends_with_period = sum(1 for msg in messages if msg.endswith('.'))
-    
-    return {
-        "avg_length": int(sum(lengths) / len(lengths)),
-        "avg_words": int(sum(word_counts) / len(word_counts)),
-        "uses_capitalization": capitalized / len(messages) > 0.7,
-        "uses_periods": ends_with_period / len(messages) > 0.3
-    }
+    return _analyze_all(messages)["structure"]
 
 
 def analyze_keywords(messages: List[str]) -> Dict[str, Any]:
     """Extract common keywords and action words."""
-    # Common action words
-    action_words = ['add', 'fix', 'update', 'remove', 'refactor', 'implement',
-                    'create', 'delete', 'modify', 'improve', 'enhance', 'optimize']
-    
-    # Extract all words (lowercase)
-    all_words = []
-    found_actions = []
-    
-    for msg in messages:
-        words = re.findall(r'\b\w+\b', msg.lower())
-        all_words.extend(words)
-        
-        # Check for action words
-        for action in action_words:
-            if action in words:
-                found_actions.append(action)
-    
-    # Count frequencies
-    word_counter = Counter(all_words)
-    action_counter = Counter(found_actions)
-    
-    # Filter out common stop words
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with'}
-    meaningful_words = {w: c for w, c in word_counter.items() if w not in stop_words and len(w) > 3}
-    
-    top_keywords = [
-        {"word": word, "count": count}
-        for word, count in Counter(meaningful_words).most_common(10)
-    ]
-    
-    top_actions = [
-        {"word": action, "count": count}
-        for action, count in action_counter.most_common(5)
-    ]
-    
-    return {
-        "top_keywords": top_keywords,
-        "action_words": top_actions
-    }
+    return _analyze_all(messages)["keywords"]
 
 
 def analyze_tone(messages: List[str]) -> str:
     """Determine the dominant tone/style of commit messages."""
-    # Imperative: "Add feature", "Fix bug"
-    imperative_count = sum(
-        1 for msg in messages
-        if msg.split()[0].lower() in ['add', 'fix', 'update', 'remove', 'refactor', 
-                                       'implement', 'create', 'delete', 'improve']
-    )
-    
-    # Past tense: "Added feature", "Fixed bug"
-    past_tense_count = sum(
-        1 for msg in messages
-        if msg.split()[0].lower() in ['added', 'fixed', 'updated', 'removed', 
-                                       'refactored', 'implemented', 'created', 'deleted']
-    )
-    
-    # Present continuous: "Adding feature", "Fixing bug"
-    continuous_count = sum(
-        1 for msg in messages
-        if msg.split()[0].lower().endswith('ing')
-    )
-    
-    # Determine dominant style
-    if imperative_count > past_tense_count and imperative_count > continuous_count:
-        return "imperative"
-    elif past_tense_count > continuous_count:
-        return "past_tense"
-    elif continuous_count > 0:
-        return "continuous"
-    else:
-        return "casual"
+    return _analyze_all(messages)["tone"]
 
 
 def analyze_emoji_usage(messages: List[str]) -> Dict[str, Any]:
     """Analyze emoji usage in commit messages."""
-    emoji_pattern = re.compile(
-        r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF'
-        r'\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+'
-    )
-    
-    messages_with_emoji = sum(1 for msg in messages if emoji_pattern.search(msg))
-    
-    # Extract all emoji
-    all_emoji = []
-    for msg in messages:
-        found = emoji_pattern.findall(msg)
-        all_emoji.extend(found)
-    
-    emoji_counter = Counter(all_emoji)
-    common_emoji = [
-        {"emoji": emoji, "count": count}
-        for emoji, count in emoji_counter.most_common(5)
-    ]
-    
-    return {
-        "uses_emoji": messages_with_emoji / len(messages) > 0.1,
-        "emoji_ratio": messages_with_emoji / len(messages),
-        "common_emoji": common_emoji
-    }
+    return _analyze_all(messages)["emoji"]
 
 
 def generate_style_summary(profile: Dict[str, Any]) -> str:
     """Generate human-readable summary of commit style."""
     if profile["total_commits"] == 0:
         return "No commit history found. Recommendations will use defaults."
+    if profile["total_commits"] < _MIN_COMMITS_TO_LEARN:
+        return (f"Only {profile['total_commits']} commits so far, too few to learn from. "
+                "Recommendations will use defaults.")
     
     parts = []
     
@@ -287,76 +374,132 @@ def generate_style_summary(profile: Dict[str, Any]) -> str:
     return "\n".join(parts)
 
 
-def get_recommendations_from_profile(
-    profile: Dict[str, Any],
-    current_message: str
-) -> List[str]:
-    """Generate recommendations based on learned profile.
+def compile_recommender(profile: Dict[str, Any]) -> Callable[[str], List[str]]:
+    """Build a recommendation function specialized for one profile.
+    
+    Everything that depends only on the profile is looked up once here, so
+    the returned function only inspects the message; reuse it while the
+    user is composing.
     
     Args:
         profile: User's commit style profile
-        current_message: The message user is currently writing
         
     Returns:
-        List of helpful suggestions
+        Function taking the message being written, returning suggestions
     """
-    suggestions = []
-    
-    if not current_message:
-        return suggestions
+    # Averages from a handful of commits would only be noise
+    if profile["total_commits"] < _MIN_COMMITS_TO_LEARN:
+        return lambda current_message: []
     
-    # Prefix recommendation
-    if profile["prefixes"]["uses_conventional"] and ':' not in current_message:
+    prefix_tip = None
+    if profile["prefixes"]["uses_conventional"]:
         top_prefix = "feat"
         if profile["prefixes"]["common_prefixes"]:
             top_prefix = profile["prefixes"]["common_prefixes"][0]["prefix"]
-        suggestions.append(f"💡 Try adding `{top_prefix}:` prefix (you use it often)")
+        prefix_tip = f"💡 Try adding `{top_prefix}:` prefix (you use it often)"
     
-    # Length recommendation
-    words = len(current_message.split())
-    if words < profile["structure"]["avg_words"] * 0.6:
-        suggestions.append(f"💡 Your messages usually have ~{profile['structure']['avg_words']} words. Add more detail?")
+    avg_words = profile["structure"]["avg_words"]
+    min_words = avg_words * 0.6
+    length_tip = f"💡 Your messages usually have ~{avg_words} words. Add more detail?"
+    uses_capitalization = profile["structure"]["uses_capitalization"]
     
-    # Capitalization
-    if profile["structure"]["uses_capitalization"] and current_message and not current_message[0].isupper():
-        suggestions.append("💡 Consider capitalizing first letter (matches your style)")
+    emoji_tip = None
+    if profile["emoji"]["uses_emoji"] and profile["emoji"].get("common_emoji"):
+        emoji = profile["emoji"]["common_emoji"][0]["emoji"]
+        emoji_tip = f"💡 Add an emoji? (you often use {emoji})"
     
-    # Emoji
-    if profile["emoji"]["uses_emoji"] and not re.search(r'[\U0001F600-\U0001F64F]', current_message):
-        if profile["emoji"]["common_emoji"]:
-            emoji = profile["emoji"]["common_emoji"][0]["emoji"]
-            suggestions.append(f"💡 Add an emoji? (you often use {emoji})")
+    def recommend(current_message: str) -> List[str]:
+        suggestions = []
+        
+        if not current_message:
+            return suggestions
+        
+        # Prefix recommendation
+        if prefix_tip and ':' not in current_message:
+            suggestions.append(prefix_tip)
+        
+        # Length recommendation
+        if len(current_message.split()) < min_words:
+            suggestions.append(length_tip)
+        
+        # Capitalization
+        if uses_capitalization and not current_message[0].isupper():
+            suggestions.append("💡 Consider capitalizing first letter (matches your style)")
+        
+        # Emoji
+        if emoji_tip and not _FACE_EMOJI_RE.search(current_message):
+            suggestions.append(emoji_tip)
+        
+        return suggestions
     
-    return suggestions
+    return recommend
 
 
-def save_profile_to_cache(repo_path: str, profile: Dict[str, Any]) -> bool:
-    """Save learned profile to cache for faster future use."""
+def get_recommendations_from_profile(
+    profile: Dict[str, Any],
+    current_message: str
+) -> List[str]:
+    """Generate recommendations based on learned profile.
+    
+    Args:
+        profile: User's commit style profile
+        current_message: The message user is currently writing
+        
+    Returns:
+        List of helpful suggestions
+    """
+    return compile_recommender(profile)(current_message)
+
+
+def save_profile_to_cache(
+    repo_path: str,
+    profile: Dict[str, Any],
+    head: Optional[str] = None,
+    limit: Optional[int] = None
+) -> bool:
+    """Save learned profile to cache for faster future use.
+    
+    The HEAD commit and limit it was analyzed at are stored with it so
+    load_profile_from_cache can tell whether it is still current.
+    """
     try:
-        from .config_manager import update_user_profile
+        from .config_manager import get_user_profile, update_user_profile
         
         # Get repo name
         repo_name = os.path.basename(repo_path)
         
-        # Update in config
-        return update_user_profile({
-            "repos": {
-                repo_name: profile
-            }
-        })
+        # Update in config, keeping the other repos' profiles
+        repos = dict(get_user_profile().get("repos", {}))
+        repos[repo_name] = {"head": head, "limit": limit, "profile": profile}
+        return update_user_profile({"repos": repos})
     except Exception:
         return False
 
 
-def load_profile_from_cache(repo_path: str) -> Optional[Dict[str, Any]]:
-    """Load previously learned profile from cache."""
+def load_profile_from_cache(
+    repo_path: str,
+    head: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Load previously learned profile from cache.
+    
+    When head is given, only a profile analyzed at that HEAD with the same
+    limit is returned.
+    """
     try:
         from .config_manager import get_user_profile
         
         repo_name = os.path.basename(repo_path)
         profile_data = get_user_profile()
         
-        return profile_data.get("repos", {}).get(repo_name)
+        cached = profile_data.get("repos", {}).get(repo_name)
+        if not cached or "profile" not in cached:
+            # Entries saved before HEAD tracking are bare profiles
+            return None if head else cached
+        
+        if head and (cached.get("head") != head or cached.get("limit") != limit):
+            return None
+        return cached["profile"]
     except Exception:
         return None
 
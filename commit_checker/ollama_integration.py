@@ -3,16 +3,34 @@
 Provides local AI-powered commit suggestions using Ollama.
 User can use ANY Ollama model - automatically detects installed models.
 """
+import re
 import subprocess
 import json
+import time
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+# Decode API replies with orjson when installed (the "speed" extra); both take bytes
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 
 # Ollama API endpoint (local)
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
 OLLAMA_LIST_URL = "http://localhost:11434/api/tags"
 
+# List numbering and bullets in front of a suggestion ("1. ", "2) ", "- ", "* ")
+_LEAD_RE = re.compile(r'^[\d.*\-) ]+')
+
+# One keep-alive connection to the local server for probes and generation
+_SESSION = requests.Session()
+
+# Models rarely change mid-session; reuse a successful probe for a minute
+_PROBE_TTL = 60.0
+_PROBE_CACHE = {"ts": 0.0, "models": None}
+
 
 def is_ollama_installed() -> bool:
     """Check if Ollama is installed and running."""
@@ -29,13 +47,40 @@ def is_ollama_installed() -> bool:
         return False
 
 
-def is_ollama_running() -> bool:
-    """Check if Ollama service is running."""
+def _probe_ollama() -> Tuple[bool, List[str]]:
+    """Ask Ollama for its model list, reusing a recent successful answer.
+    
+    Returns:
+        (running, model names) from a single /api/tags request
+    """
+    now = time.monotonic()
+    if _PROBE_CACHE["models"] is not None and now - _PROBE_CACHE["ts"] < _PROBE_TTL:
+        return True, list(_PROBE_CACHE["models"])
+    
+    # Failures are never cached, so a restarted server is seen right away
+    _PROBE_CACHE["models"] = None
     try:
-        response = requests.get(OLLAMA_LIST_URL, timeout=2)
-        return response.status_code == 200
+        response = _SESSION.get(OLLAMA_LIST_URL, timeout=2)
     except requests.RequestException:
-        return False
+        return False, []
+    
+    if response.status_code != 200:
+        return False, []
+    
+    try:
+        models = _loads(response.content).get('models', [])
+        model_names = [model['name'] for model in models if 'name' in model]
+    except Exception:
+        return True, []
+    
+    _PROBE_CACHE["models"] = model_names
+    _PROBE_CACHE["ts"] = now
+    return True, list(model_names)
+
+
+def is_ollama_running() -> bool:
+    """Check if Ollama service is running."""
+    return _probe_ollama()[0]
 
 
 def get_installed_models() -> List[str]:
@@ -44,20 +89,7 @@ def get_installed_models() -> List[str]:
     Returns:
         List of model names (e.g., ['llama3', 'mistral', 'codellama'])
     """
-    try:
-        response = requests.get(OLLAMA_LIST_URL, timeout=5)
-        if response.status_code != 200:
-            return []
-        
-        data = response.json()
-        models = data.get('models', [])
-        
-        # Extract model names
-        model_names = [model['name'] for model in models if 'name' in model]
-        return model_names
-    
-    except Exception:
-        return []
+    return _probe_ollama()[1]
 
 
 def select_default_model(models: List[str]) -> Optional[str]:
@@ -105,8 +137,9 @@ def generate_commit_message(
     Returns:
         Dict with 'suggestions' list and optional 'error'
     """
-    # Check if Ollama is available
-    if not is_ollama_running():
+    # Check if Ollama is available (the same request lists the models)
+    running, models = _probe_ollama()
+    if not running:
         return {
             'error': 'Ollama is not running. Start it with: ollama serve',
             'suggestions': []
@@ -119,7 +152,6 @@ def generate_commit_message(
     
     if not model_name:
         # Auto-select
-        models = get_installed_models()
         model_name = select_default_model(models)
     
     if not model_name:
@@ -132,34 +164,31 @@ def generate_commit_message(
     prompt = build_commit_prompt(diff_summary, user_profile)
     
     try:
-        # Call Ollama API
+        # Call Ollama API (streamed, so we can stop after 3 suggestions)
         payload = {
             'model': model_name,
             'prompt': prompt,
-            'stream': False,
+            'stream': True,
             'options': {
                 'temperature': 0.7,
                 'num_predict': 200
             }
         }
         
-        response = requests.post(
+        with _SESSION.post(
             OLLAMA_API_URL,
             json=payload,
+            stream=True,
             timeout=30
-        )
-        
-        if response.status_code != 200:
-            return {
-                'error': f'Ollama API error: {response.status_code}',
-                'suggestions': []
-            }
-        
-        result = response.json()
-        ai_response = result.get('response', '').strip()
-        
-        # Parse suggestions
-        suggestions = parse_ollama_response(ai_response)
+        ) as response:
+            if response.status_code != 200:
+                return {
+                    'error': f'Ollama API error: {response.status_code}',
+                    'suggestions': []
+                }
+            
+            # Leaving the block closes the connection, which cancels generation
+            suggestions = _stream_suggestions(response)
         
         return {
             'suggestions': suggestions,
@@ -167,6 +196,7 @@ def generate_commit_message(
         }
     
     except requests.RequestException as e:
+        _PROBE_CACHE["models"] = None
         return {
             'error': f'Network error: {str(e)}',
             'suggestions': []
@@ -178,6 +208,26 @@ def generate_commit_message(
         }
 
 
+def _stream_suggestions(response) -> List[str]:
+    """Collect streamed text until 3 complete suggestions have arrived."""
+    buffer = ''
+    for line in response.iter_lines():
+        if not line:
+            continue
+        
+        chunk = _loads(line)
+        buffer += chunk.get('response', '')
+        if chunk.get('done'):
+            break
+        
+        # Only finished lines count; the last one may still be growing
+        finished = buffer.replace('\\n', '\n').rpartition('\n')[0]
+        if len(parse_ollama_response(finished)) >= 3:
+            break
+    
+    return parse_ollama_response(buffer.strip())
+
+
 def build_commit_prompt(
     diff_summary: str,
     user_profile: Optional[Dict[str, Any]] = None
@@ -222,7 +272,7 @@ def build_commit_prompt(
         "3. Conventional commit format (type: description)",
         "",
         "Keep each suggestion under 72 characters.",
-        "Format as: 1. <message>\\n2. <message>\\n3. <message>"
+        "Format as: 1. <message>\n2. <message>\n3. <message>"
     ])
     
     return "\n".join(prompt_parts)
@@ -232,12 +282,12 @@ def parse_ollama_response(response: str) -> List[str]:
     """Parse Ollama response into suggestions list."""
     suggestions = []
     
-    # Split by newlines and look for numbered items
-    lines = [line.strip() for line in response.split('\\n') if line.strip()]
+    # Split by newlines (real or escaped) and look for numbered items
+    lines = [line.strip() for line in response.replace('\\n', '\n').splitlines() if line.strip()]
     
     for line in lines:
         # Remove numbering (1., 2., etc.)
-        cleaned = line.lstrip('123456789.*-) ').strip()
+        cleaned = _LEAD_RE.sub('', line).strip()
         
         # Filter valid suggestions
         if cleaned and 5 < len(cleaned) < 150:
@@ -252,11 +302,11 @@ def parse_ollama_response(response: str) -> List[str]:
 
 def print_status():
     """Print Ollama status."""
-    print("\\n🦙 Ollama Status")
+    print("\n🦙 Ollama Status")
     print("=" * 60)
     
     installed = is_ollama_installed()
-    running = is_ollama_running()
+    running, models = _probe_ollama()
     
     if not installed:
         print("❌ Ollama not installed")
@@ -272,7 +322,6 @@ def print_status():
     
     print("✅ Ollama running")
     
-    models = get_installed_models()
     if not models:
         print("⚠️  No models installed")
         print("   Install: ollama pull llama3")
@@ -285,12 +334,12 @@ def print_status():
     # Show recommended model
     recommended = select_default_model(models)
     if recommended:
-        print(f"\\n🎯 Recommended: {recommended}")
+        print(f"\n🎯 Recommended: {recommended}")
 
 
 def print_setup_instructions():
     """Print setup instructions for Ollama."""
-    print("\\n🦙 Ollama Setup")
+    print("\n🦙 Ollama Setup")
     print("=" * 60)
     print("1. Install Ollama:")
     print("   • Visit: https://ollama.com/download")
@@ -319,7 +368,7 @@ if __name__ == "__main__":
     
     # Test with sample diff
     if is_ollama_running():
-        print("\\n📝 Testing generation...")
+        print("\n📝 Testing generation...")
         sample_diff = "Changes: 2 files, +45/-3 lines | Modified: auth.py, config.py"
         
         result = generate_commit_message(sample_diff)
@@ -1,121 +1,273 @@
 import os
-import subprocess
 import platform
+import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-def is_git_repo(path):
-    """Check if a directory is a git repository"""
+# Upper bound on threads checking candidate dev folders at once
+_MAX_STAT_WORKERS = 8
+
+# Paths already found missing this run (most platform candidates, on any
+# one machine), so repeated checks skip the failing stat; see clear_path_cache
+_missing_paths = set()
+
+# Dependency and cache folders that never hold a user's repositories
+_SKIP_DIRS = frozenset({
+    "node_modules", "venv", ".venv", ".tox", ".nox", "__pycache__",
+    ".mypy_cache", ".pytest_cache", "site-packages", "target",
+})
+
+def _has_dot_git(directory):
+    """Check for a .git directory, or a .git file pointing elsewhere (worktrees, submodules)"""
+    dot_git = os.path.join(directory, '.git')
     try:
-        subprocess.run(['git', 'rev-parse', '--git-dir'], 
-                      cwd=path, capture_output=True, check=True)
+        st = os.stat(dot_git)
+    except OSError:
+        return False
+    if stat.S_ISDIR(st.st_mode):
         return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    return stat.S_ISREG(st.st_mode) and _is_gitdir_file(dot_git)
+
+def _is_gitdir_file(path):
+    """Check whether a .git file is a 'gitdir: <path>' pointer"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(7) == b'gitdir:'
+    except OSError:
+        return False
+
+def is_git_repo(path):
+    """Check if a directory is inside a git repository, without running git"""
+    path = Path(path).absolute()
+    if not path.is_dir():
         return False
+    
+    # Same lookup git does: a .git directory (or gitdir file) here or above
+    return _has_dot_git(path) or _in_enclosing_repo(path)
+
+def _in_enclosing_repo(path):
+    """Check the parts of git's lookup beyond path's own .git: parents, then bare"""
+    if any(_has_dot_git(parent) for parent in path.parents):
+        return True
+    
+    # Bare repositories keep HEAD, objects and refs at the top level
+    return (path / 'HEAD').is_file() and (path / 'objects').is_dir() and (path / 'refs').is_dir()
 
 def get_current_git_repo():
     """Get current directory if it's a git repo"""
-    current_dir = os.getcwd()
+    return _git_repo_at(os.getcwd())
+
+@lru_cache(maxsize=8)
+def _git_repo_at(current_dir):
+    """current_dir if it's a git repo, else None (memoized per directory)"""
     if is_git_repo(current_dir):
         return current_dir
     return None
 
-def get_common_dev_paths():
-    """Get common development folder paths based on OS"""
-    home = Path.home()
-    system = platform.system().lower()
+def _home_dir_names(home, fold_case=False):
+    """Directories directly under home, from one scandir: {key: (name, is_symlink)}
     
-    common_paths = set()  # Use set to avoid duplicates
+    With fold_case the key is name.casefold(), for filesystems that match
+    names in any case; name is always the entry's real spelling.
+    """
+    try:
+        with os.scandir(home) as it:
+            # is_dir()/is_symlink() use the cached entry type; only symlinks get a stat
+            return {
+                (entry.name.casefold() if fold_case else entry.name): (entry.name, entry.is_symlink())
+                for entry in it if entry.is_dir()
+            }
+    except OSError:
+        return {}
+
+def _resolve_dev_path(path, is_link=None):
+    """Absolute path if path is a directory, else None
     
-    # Cross-platform common paths
-    common_names = [
+    is_link is passed when path is already known to be a directory (and
+    whether it is a symlink); otherwise a single lstat finds out. Only
+    symlinks are fully resolved, so two names for one folder dedupe; other
+    paths are just normalized, without realpath's walk over every component.
+    """
+    key = str(path)
+    if key in _missing_paths:
+        return None
+    try:
+        if is_link is None:
+            mode = os.lstat(key).st_mode
+            is_link = stat.S_ISLNK(mode)
+            if not is_link and not stat.S_ISDIR(mode):
+                _missing_paths.add(key)
+                return None
+        if not is_link:
+            return os.path.normpath(os.path.abspath(key))
+        resolved = path.resolve()
+        if not resolved.is_dir():
+            _missing_paths.add(key)
+            return None
+        return str(resolved)
+    except OSError:
+        _missing_paths.add(key)
+        return None
+
+def _build_candidates(system):
+    """Candidate dev folders for an OS: (home-relative names, absolute paths)"""
+    # Cross-platform common paths, relative to the home directory
+    home_names = [
         'Documents/GitHub', 'Documents/Github', 'Documents/git',
         'github', 'Github', 'git', 'dev', 'Development', 'code', 'Code',
         'projects', 'Projects', 'workspace', 'Workspace', 'src'
     ]
-    
-    # Add paths relative to home directory
-    for name in common_names:
-        path = home / name
-        if path.exists() and path.is_dir():
-            # Resolve to absolute path to avoid duplicates
-            resolved_path = str(path.resolve())
-            common_paths.add(resolved_path)
+    absolute_paths = []
     
     # Platform-specific paths
     if system == 'darwin':  # macOS
-        mac_paths = [
-            home / 'Developer',
-            home / 'Desktop/GitHub',
-            home / 'Desktop/Projects',
+        home_names += ['Developer', 'Desktop/GitHub', 'Desktop/Projects']
+        absolute_paths = [
             Path('/Applications/XAMPP/htdocs'),
             Path('/usr/local/var/www')
         ]
-        for path in mac_paths:
-            if path.exists() and path.is_dir():
-                resolved_path = str(path.resolve())
-                common_paths.add(resolved_path)
                 
     elif system == 'linux':
-        linux_paths = [
-            home / 'workspace',
-            home / 'devel',
+        home_names += ['workspace', 'devel']
+        absolute_paths = [
             Path('/var/www'),
             Path('/opt/lampp/htdocs'),
             Path('/home/git')
         ]
-        for path in linux_paths:
-            if path.exists() and path.is_dir():
-                resolved_path = str(path.resolve())
-                common_paths.add(resolved_path)
                 
     elif system == 'windows':
-        windows_paths = [
-            home / 'source',
-            home / 'Source',
+        home_names += ['source', 'Source']
+        absolute_paths = [
             Path('C:\\inetpub\\wwwroot'),
             Path('C:\\xampp\\htdocs'),
             Path('C:\\wamp\\www'),
             Path('D:\\Projects'),
             Path('C:\\Projects')
         ]
-        for path in windows_paths:
-            if path.exists() and path.is_dir():
-                resolved_path = str(path.resolve())
+    
+    # Split each name once: its first component, and whether it is nested
+    home_candidates = []
+    for name in dict.fromkeys(home_names):
+        top, _, rest = name.partition('/')
+        home_candidates.append((name, top, bool(rest)))
+    return tuple(home_candidates), tuple(absolute_paths)
+
+# The candidate list only depends on the OS, so it is built once at import
+_HOME_CANDIDATES, _ABSOLUTE_CANDIDATES = _build_candidates(platform.system().lower())
+
+# macOS (APFS/HFS+) and Windows (NTFS) home folders match names in any case
+_CASE_INSENSITIVE_HOME = platform.system().lower() in ('darwin', 'windows')
+
+def get_common_dev_paths():
+    """Get common development folder paths based on OS, as a sorted tuple"""
+    # Memoized and immutable, so every path-suggestion helper shares one result
+    return _common_dev_paths(str(Path.home()))
+
+@lru_cache(maxsize=4)
+def _common_dev_paths(home):
+    """Existing common dev folders under a home directory, as a sorted tuple"""
+    home = Path(home)
+    common_paths = set()  # Use set to avoid duplicates
+    
+    # One listing of home answers every top-level name (and whether it is a
+    # symlink); only nested names whose parent is present need an lstat
+    present = _home_dir_names(home, _CASE_INSENSITIVE_HOME)
+    paths, known_links = [], []
+    for name, top, nested in _HOME_CANDIDATES:
+        entry = present.get(top.casefold() if _CASE_INSENSITIVE_HOME else top)
+        if entry is not None:
+            # Report the folder's real spelling: ~/GitHub answers both "github"
+            # and "Github" and is listed once
+            real_top, is_link = entry
+            paths.append(home / real_top / name[len(top) + 1:] if nested else home / real_top)
+            known_links.append(None if nested else is_link)
+    paths.extend(_ABSOLUTE_CANDIDATES)
+    known_links.extend([None] * len(_ABSOLUTE_CANDIDATES))
+    
+    # The remaining stats and resolves wait on the filesystem, not the GIL,
+    # so overlap them rather than paying each mount's latency in turn
+    with ThreadPoolExecutor(max_workers=min(_MAX_STAT_WORKERS, len(paths) or 1)) as executor:
+        for resolved_path in executor.map(_resolve_dev_path, paths, known_links):
+            if resolved_path:
                 common_paths.add(resolved_path)
     
-    return sorted(list(common_paths))  # Return sorted list
+    return tuple(sorted(common_paths))  # Sorted, and hashable for the cache
 
-def find_git_repos_in_path(base_path, max_depth=2):
-    """Find git repositories in a given path"""
-    git_repos = []
-    base_path = Path(base_path)
+def find_git_repos_in_path(base_path, max_depth=2, first_only=False):
+    """Find git repositories in a given path
     
-    if not base_path.exists():
-        return git_repos
+    With first_only the walk stops at the first repository found, for
+    callers that only need to know whether there are any.
+    """
+    # Results are memoized, so the several callers per run share one walk
+    return list(_find_git_repos_cached(str(Path(base_path)), max_depth, first_only))
+
+@lru_cache(maxsize=64)
+def _find_git_repos_cached(base_path, max_depth, first_only=False):
+    """Walk base_path breadth-first with os.scandir, stopping at repos and below max_depth"""
+    if base_path in _missing_paths:
+        return ()
     
-    try:
-        # Check if base path itself is a git repo
-        if is_git_repo(base_path):
-            git_repos.append(str(base_path))
-            return git_repos
+    git_repos = []
+    # Breadth-first, so shallow repos (the usual layout) are reached before
+    # any deeper subtree is listed - which matters most with first_only
+    pending = deque([(base_path, 0)])
+    while pending:
+        current, current_depth = pending.popleft()
+        # One pass per listing: DirEntry caches each entry's type from
+        # readdir, so neither the .git check nor the subdir split stats
+        is_repo = False
+        subdirs = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name == '.git':
+                        # A directory, or a worktree/submodule gitdir file;
+                        # both types come from the entry, not another stat
+                        if entry.is_dir() or (entry.is_file(follow_symlinks=False)
+                                              and _is_gitdir_file(entry.path)):
+                            is_repo = True
+                            break
+                    elif entry.name not in _SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+        except FileNotFoundError:
+            if current_depth == 0:
+                _missing_paths.add(base_path)
+            continue
+        except OSError:
+            # Skip directories we can't access
+            continue
         
-        # Search for git repos in subdirectories
-        for root, dirs, files in os.walk(base_path):
-            # Calculate current depth
-            current_depth = len(Path(root).parts) - len(base_path.parts)
-            if current_depth > max_depth:
-                continue
-                
-            if '.git' in dirs:
-                git_repos.append(root)
-                # Don't search within this git repo
-                dirs.clear()
-                
-    except PermissionError:
-        # Skip directories we can't access
-        pass
+        # The base's own .git is seen in its listing; a base inside a repo
+        # (or a bare one) still counts as a repo, as is_git_repo would say
+        if current_depth == 0 and not is_repo and _in_enclosing_repo(Path(current).absolute()):
+            return (base_path,)
+        
+        if is_repo:
+            git_repos.append(current)
+            if first_only:
+                break
+            # Don't search within this git repo
+            continue
         
-    return git_repos
+        # Only descend while children are still within max_depth
+        if current_depth < max_depth:
+            pending.extend((path, current_depth + 1) for path in subdirs)
+    
+    return tuple(git_repos)
+
+def _scan_for_any_repo(path, max_depth):
+    """Check whether path holds a git repo within max_depth, stopping at the first"""
+    return bool(_find_git_repos_cached(str(Path(path)), max_depth, True))
+
+def clear_path_cache():
+    """Forget remembered missing paths and memoized scans, e.g. after creating folders"""
+    _missing_paths.clear()
+    _common_dev_paths.cache_clear()
+    _find_git_repos_cached.cache_clear()
+    _git_repo_at.cache_clear()
 
 def get_suggested_paths():
     """Get suggested paths for the user"""
@@ -147,8 +299,7 @@ def auto_detect_dev_paths():
     # Check common paths for git repos
     common_paths = get_common_dev_paths()
     for path in common_paths:
-        git_repos = find_git_repos_in_path(path, max_depth=2)
-        if git_repos:
+        if _scan_for_any_repo(path, max_depth=2):
             detected_paths.append(path)
     
     return detected_paths
@@ -163,8 +314,7 @@ def get_best_default_path():
     # Try common paths
     common_paths = get_common_dev_paths()
     for path in common_paths:
-        git_repos = find_git_repos_in_path(path, max_depth=1)
-        if git_repos:
+        if _scan_for_any_repo(path, max_depth=1):
             return path
     
     # Fallback to home directory
@@ -7,13 +7,23 @@ Provides:
 """
 import os
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
-import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 import json
 
-# Cache for git command results to avoid redundant calls
-_git_cache = {}
+# Default worker count for parallel git operations: about 3/4 of the CPUs
+_DEFAULT_WORKERS = max(1, min(32, (os.cpu_count() or 4) * 3 // 4))
+
+# Cache for git command results to avoid redundant calls: least recently
+# used entries go once _CACHE_MAX is reached, and results older than
+# _CACHE_TTL seconds are run again. Values are (monotonic time, output).
+_CACHE_MAX = 4096
+_CACHE_TTL = 60.0
+_git_cache = OrderedDict()
+_git_cache_lock = threading.Lock()
 _cache_enabled = True
 
 def enable_git_cache(enabled=True):
@@ -24,7 +34,21 @@ def enable_git_cache(enabled=True):
 def clear_git_cache():
     """Clear the git command cache."""
     global _git_cache
-    _git_cache = {}
+    with _git_cache_lock:
+        _git_cache = OrderedDict()
+
+def _run_git(repo_path, command):
+    """Run a git command; stripped stdout, or "" on failure (including a missing repo_path)"""
+    try:
+        result = subprocess.run(
+            ['git'] + command,
+            cwd=repo_path,
+            capture_output=True,
+            text=True
+        )
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
 
 def cached_git_command(repo_path, command, cache_key=None):
     """Execute git command with caching to avoid redundant calls.
@@ -32,54 +56,84 @@ def cached_git_command(repo_path, command, cache_key=None):
     Args:
         repo_path (str): Path to git repository
         command (list): Git command arguments
-        cache_key (str): Optional custom cache key
+        cache_key (hashable): Optional custom cache key
         
     Returns:
         str: Command output
     """
     if not _cache_enabled:
-        result = subprocess.run(
+        return _run_git(repo_path, command)
+    
+    # Key on repo path and command directly; the dict does the hashing
+    if cache_key is None:
+        cache_key = (repo_path, tuple(command))
+    
+    now = time.monotonic()
+    with _git_cache_lock:
+        cached = _git_cache.get(cache_key)
+        if cached is not None and now - cached[0] < _CACHE_TTL:
+            _git_cache.move_to_end(cache_key)
+            return cached[1]
+    
+    output = _run_git(repo_path, command)
+    with _git_cache_lock:
+        _git_cache[cache_key] = (now, output)
+        _git_cache.move_to_end(cache_key)
+        if len(_git_cache) > _CACHE_MAX:
+            _git_cache.popitem(last=False)
+    return output
+
+def stream_git_command(repo_path, command):
+    """Yield a git command's output lines as git produces them.
+    
+    Nothing is buffered or cached, so memory stays flat however long the
+    output is; stop iterating early and git is stopped with it.
+    
+    Args:
+        repo_path (str): Path to git repository
+        command (list): Git command arguments
+        
+    Yields:
+        str: Output lines, without trailing newlines
+    """
+    try:
+        proc = subprocess.Popen(
             ['git'] + command,
             cwd=repo_path,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True
         )
-        return result.stdout.strip() if result.returncode == 0 else ""
-    
-    # Create cache key from repo path and command
-    if cache_key is None:
-        cache_key = hashlib.md5(
-            f"{repo_path}::{' '.join(command)}".encode()
-        ).hexdigest()
-    
-    if cache_key in _git_cache:
-        return _git_cache[cache_key]
-    
-    result = subprocess.run(
-        ['git'] + command,
-        cwd=repo_path,
-        capture_output=True,
-        text=True
-    )
+    except OSError:
+        return
     
-    output = result.stdout.strip() if result.returncode == 0 else ""
-    _git_cache[cache_key] = output
-    return output
+    with proc:
+        for line in proc.stdout:
+            yield line.rstrip('\n')
 
-def parallel_git_operation(repos, operation_func, max_workers=4):
+def parallel_git_operation(repos, operation_func, max_workers=None, use_processes=False):
     """Execute git operations in parallel across multiple repositories.
     
+    Threads suit operations that mostly wait on git. Pass use_processes=True
+    when operation_func does heavy Python-side parsing, which threads would
+    serialize on the GIL; operation_func must then be picklable (a
+    module-level function or a partial of one), and each worker process
+    has its own git cache.
+    
     Args:
         repos (list): List of repository paths
         operation_func (callable): Function to execute on each repo
         max_workers (int): Maximum number of parallel workers
+            (default: about 3/4 of the CPUs)
+        use_processes (bool): Run in worker processes instead of threads
         
     Returns:
         dict: Results keyed by repo path
     """
     results = {}
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with executor_class(max_workers=max_workers or _DEFAULT_WORKERS) as executor:
         future_to_repo = {
             executor.submit(operation_func, repo): repo 
             for repo in repos
@@ -94,26 +148,43 @@ def parallel_git_operation(repos, operation_func, max_workers=4):
     
     return results
 
-def get_repo_commits_parallel(repos, since_date=None, max_workers=4):
+def get_commits(repo_path, since_date=None, limit=None, fields='%H %s'):
+    """Get one record per commit (merges excluded) for a repository.
+    
+    fields is a git log --format string: '%H' alone is cheapest, and the
+    full hash skips the abbreviation lookup --oneline needs. Records are
+    NUL-separated (-z), so fields containing newlines (e.g. %b) stay whole.
+    With limit, only the newest limit commits are returned; git itself
+    stops there instead of printing the whole history.
+    """
+    cmd = ['log', '--no-merges', '-z', f'--format={fields}']
+    if since_date:
+        cmd.extend(['--since', since_date])
+    if limit is not None:
+        cmd.append(f'-n{limit}')
+    
+    output = cached_git_command(repo_path, cmd)
+    # -z terminates every record with NUL, including the last
+    return output.rstrip('\x00').split('\x00') if output else []
+
+def get_repo_commits_parallel(repos, since_date=None, max_workers=None, limit=None, fields='%H %s'):
     """Get commits from multiple repos in parallel.
     
+    Uses threads: the work is waiting on git, and they share the git cache.
+    
     Args:
         repos (list): List of repository paths
         since_date (str): Optional date filter (e.g., '2025-01-01')
         max_workers (int): Number of parallel workers
+        limit (int): Optional cap on commits per repo
+        fields (str): git log --format fields per commit (default: hash and subject)
         
     Returns:
         dict: Commits by repo path
     """
-    def get_commits(repo_path):
-        cmd = ['log', '--oneline', '--no-merges']
-        if since_date:
-            cmd.extend(['--since', since_date])
-        
-        output = cached_git_command(repo_path, cmd)
-        return output.split('\n') if output else []
-    
-    return parallel_git_operation(repos, get_commits, max_workers)
+    return parallel_git_operation(
+        repos, partial(get_commits, since_date=since_date, limit=limit, fields=fields), max_workers
+    )
 
 @lru_cache(maxsize=128)
 def get_cached_repo_info(repo_path):
@@ -125,12 +196,17 @@ def get_cached_repo_info(repo_path):
     Returns:
         dict: Repo name, branch, etc.
     """
-    name = cached_git_command(
-        repo_path, 
-        ['rev-parse', '--show-toplevel']
-    ).split('/')[-1] if os.path.exists(repo_path) else os.path.basename(repo_path)
-    
-    branch = cached_git_command(repo_path, ['branch', '--show-current'])
+    # One git call for both: prints the top-level path, then the branch
+    # name ("HEAD" when detached); fails outside a repo (or a missing path)
+    # and on a repo with no commits yet, leaving the fallbacks below
+    output = cached_git_command(
+        repo_path,
+        ['rev-parse', '--show-toplevel', '--abbrev-ref', 'HEAD']
+    )
+    toplevel, _, branch = output.partition('\n')
+    name = os.path.basename(toplevel) if toplevel else os.path.basename(repo_path)
+    if branch == 'HEAD':
+        branch = ''
     
     return {
         'name': name,
@@ -1,19 +1,42 @@
 import os
 import subprocess
-import json
 import re
 import collections
+import copy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache, wraps
 from typing import Dict, List, Optional, Tuple, Any
 
+# Compiled once; these run for every commit message and diff summary
+_EMOJI_RE = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+')
+_FILES_RE = re.compile(r'(\d+)\s+file')
+_INS_RE = re.compile(r'(\d+)\s+insertion')
+_DEL_RE = re.compile(r'(\d+)\s+deletion')
+
+def _has_emoji(text: str) -> bool:
+    """
+    Emoji check; every _EMOJI_RE range is non-ASCII, so ASCII text skips the regex
+    """
+    return not text.isascii() and _EMOJI_RE.search(text) is not None
+
 def run_git(cmd: List[str], cwd: str) -> Optional[str]:
     """
     Run git command safely with fallbacks
     Returns None if command fails (e.g., not a git repo, git not available)
+    Results are memoized per (cmd, cwd) for the life of the process
+    """
+    return _run_git_cached(tuple(cmd), cwd)
+
+@lru_cache(maxsize=512)
+def _run_git_cached(cmd: Tuple[str, ...], cwd: str) -> Optional[str]:
+    """
+    Run a git command once per (cmd, cwd); see run_git
     """
     try:
         result = subprocess.check_output(
-            ["git"] + cmd,
+            ["git", *cmd],
             cwd=cwd,
             stderr=subprocess.DEVNULL,
             text=True
@@ -23,196 +46,343 @@ def run_git(cmd: List[str], cwd: str) -> Optional[str]:
         # Fallback for various errors: not a git repo, git not installed, permission issues
         return None
 
-def detect_tech_stack(repo_path: str) -> List[str]:
+@lru_cache(maxsize=128)
+def _resolve_repo_name(repo_path: str) -> str:
     """
-    Detect tech stack based on project files (shallow scan, top 2 levels only)
-    Returns list of 1-3 tech stack identifiers
-    Supports 30+ programming languages and frameworks
+    Repo name used as the profile key: the remote's name, else the folder name
+    """
+    repo_name = os.path.basename(repo_path)
+    remote_url = run_git(["config", "--get", "remote.origin.url"], repo_path)
+    if remote_url:
+        if remote_url.endswith('.git'):
+            remote_url = remote_url[:-4]
+        repo_name = remote_url.split('/')[-1]
+    return repo_name
+
+# Directories that never hold project manifests or nested repos worth profiling
+_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "venv", ".venv", ".tox", ".nox", "__pycache__",
+    ".mypy_cache", ".pytest_cache", "site-packages", "target",
+})
+
+def _head_stamp(repo_path: str) -> Optional[int]:
+    """
+    mtime of the HEAD reflog (.git/logs/HEAD); None if unavailable
+    Every commit, checkout, merge, pull or reset appends to it, while .git/HEAD
+    itself is only rewritten when HEAD switches to another ref
     """
-    # Massively expanded tech stack detection map
-    TECH_STACKS = {
-        # Existing languages
-        "python": ["requirements.txt", "pyproject.toml", "setup.py", "Pipfile"],
-        "django": ["manage.py", "settings.py"],
-        "flask": ["app.py", "run.py"],
-        "javascript": ["package.json", "package-lock.json"],
-        "react": ["src/App.js", "src/App.jsx"],
-        "typescript": ["tsconfig.json"],
-        "rust": ["Cargo.toml", "Cargo.lock"],
-        "java": ["pom.xml", "build.gradle"],
-        "go": ["go.mod", "go.sum"],
-        "csharp": [".csproj", "packages.config", "Directory.Packages.props"],
-        "ruby": ["Gemfile", "Gemfile.lock"],
-        "php": ["composer.json", "composer.lock"],
-        "swift": ["Package.swift", "Podfile"],
-        "kotlin": ["build.gradle.kts"],
-        "elixir": ["mix.exs"],
-        "scala": ["build.sbt"],
-        "haskell": ["cabal.project", "package.yaml", "stack.yaml"],
-        
-        # NEW: C/C++ and related
-        "c": ["Makefile", "CMakeLists.txt", "configure.ac"],
-        "cpp": ["CMakeLists.txt", "meson.build"],
-        "objectivec": ["Podfile", "*.xcodeproj"],
-        
-        # NEW: Mobile and cross-platform
-        "dart": ["pubspec.yaml", "pubspec.lock"],  # Flutter/Dart
-        "flutter": ["pubspec.yaml"],
-        "reactnative": ["app.json", "metro.config.js"],
-        
-        # NEW: Data science and scientific computing
-        "r": ["DESCRIPTION", "NAMESPACE", ".Rproj"],
-        "julia": ["Project.toml", "Manifest.toml"],
-        "matlab": ["*.mlx", "*.mlapp"],
-        
-        # NEW: Scripting languages
-        "perl": ["cpanfile", "Makefile.PL"],
-        "lua": ["rockspec", "*.rockspec"],
-        "bash": ["*.sh", "configure"],
-        "powershell": ["*.ps1", "*.psm1"],
-        
-        # NEW: Systems and low-level
-        "zig": ["build.zig", "build.zig.zon"],
-        "nim": ["*.nimble", "config.nims"],
-        "crystal": ["shard.yml", "shard.lock"],
-        "v": ["v.mod"],
-        "fortran": ["*.f90", "*.f95", "Makefile"],
-        "assembly": ["*.asm", "*.s"],
-        
-        # NEW: Hardware description
-        "vhdl": ["*.vhdl", "*.vhd"],
-        "verilog": ["*.v", "*.sv"],
-        
-        # NEW: Blockchain and smart contracts
-        "solidity": ["hardhat.config.js", "truffle-config.js", "foundry.toml"],
-        "move": ["Move.toml"],  # Sui/Aptos
-        "cairo": ["Scarb.toml"],  # Starknet
-        
-        # NEW: Emerging languages
-        "gren": ["gren.json"],
-        "roc": ["*.roc"],
-        
-        # NEW: Markup and config
-        "latex": ["*.tex", "*.bib"],
-        "markdown": ["*.md", "*.markdown"],
-    }
-    
-    stack = []
-    key_files = []
-    file_extensions = collections.defaultdict(int)
-    
     try:
-        # Shallow walk - only top 2 levels to avoid performance issues
-        for root, dirs, files in os.walk(repo_path):
-            # Limit depth to 2 levels from repo root
-            level = root[len(repo_path):].count(os.sep)
-            if level >= 2:
-                dirs[:] = []  # Don't go deeper
-                continue
-                
-            for file in files:
-                key_files.append(file)
-                _, ext = os.path.splitext(file)
-                if ext:
-                    file_extensions[ext.lower()] += 1
-                    
-    except (OSError, PermissionError):
-        # Fallback if directory access fails
-        return ["unknown"]
-    
-    # Primary stack detection based on manifest files
-    for tech, manifest_files in TECH_STACKS.items():
-        if tech in ["django", "flask", "react", "typescript"]:
+        return os.stat(os.path.join(repo_path, '.git', 'logs', 'HEAD')).st_mtime_ns
+    except OSError:
+        return None
+
+def _cache_per_head(func):
+    """
+    Memoize a repo analyzer per (repo_path, HEAD reflog mtime); callers get a copy
+    Repos without a readable .git/logs/HEAD (e.g. worktrees, reflogs disabled)
+    are never cached
+    """
+    @lru_cache(maxsize=64)
+    def cached(repo_path, stamp):
+        return func(repo_path)
+    
+    @wraps(func)
+    def wrapper(repo_path):
+        stamp = _head_stamp(repo_path)
+        if stamp is None:
+            return func(repo_path)
+        return copy.deepcopy(cached(repo_path, stamp))
+    
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+def _shallow_scan(root: str, max_depth: int = 2):
+    """
+    Yield (name, is_file) for entries in the top max_depth levels of root
+    Heavy tool/cache directories are pruned; unreadable directories are skipped
+    """
+    queue = deque([(root, 0)])
+    while queue:
+        path, depth = queue.popleft()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    yield entry.name, not is_dir
+                    if (is_dir and depth + 1 < max_depth and entry.name not in _SKIP_DIRS
+                            and not entry.is_symlink()):
+                        queue.append((entry.path, depth + 1))
+        except OSError:
+            continue
+
+def _find_git_repos(base: str, max_depth: int = 6) -> List[str]:
+    """
+    Find repo roots under base (in directory order), not descending into repos
+    """
+    repos = []
+    stack = [(base, 0)]
+    while stack:
+        path, depth = stack.pop()
+        subdirs = []
+        is_repo = False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name == '.git':
+                        if entry.is_dir():
+                            is_repo = True
+                            break
+                    elif (depth < max_depth and entry.name not in _SKIP_DIRS
+                            and entry.is_dir(follow_symlinks=False)):
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        if is_repo:
+            repos.append(path)
+            continue
+        # Reverse so the stack pops subdirectories in scandir order
+        stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+    return repos
+
+# Massively expanded tech stack detection map
+_TECH_STACKS = {
+    # Existing languages
+    "python": frozenset({"requirements.txt", "pyproject.toml", "setup.py", "Pipfile"}),
+    "django": frozenset({"manage.py", "settings.py"}),
+    "flask": frozenset({"app.py", "run.py"}),
+    "javascript": frozenset({"package.json", "package-lock.json"}),
+    "react": frozenset({"src/App.js", "src/App.jsx"}),
+    "typescript": frozenset({"tsconfig.json"}),
+    "rust": frozenset({"Cargo.toml", "Cargo.lock"}),
+    "java": frozenset({"pom.xml", "build.gradle"}),
+    "go": frozenset({"go.mod", "go.sum"}),
+    "csharp": frozenset({".csproj", "packages.config", "Directory.Packages.props"}),
+    "ruby": frozenset({"Gemfile", "Gemfile.lock"}),
+    "php": frozenset({"composer.json", "composer.lock"}),
+    "swift": frozenset({"Package.swift", "Podfile"}),
+    "kotlin": frozenset({"build.gradle.kts"}),
+    "elixir": frozenset({"mix.exs"}),
+    "scala": frozenset({"build.sbt"}),
+    "haskell": frozenset({"cabal.project", "package.yaml", "stack.yaml"}),
+    
+    # NEW: C/C++ and related
+    "c": frozenset({"Makefile", "CMakeLists.txt", "configure.ac"}),
+    "cpp": frozenset({"CMakeLists.txt", "meson.build"}),
+    "objectivec": frozenset({"Podfile", "*.xcodeproj"}),
+    
+    # NEW: Mobile and cross-platform
+    "dart": frozenset({"pubspec.yaml", "pubspec.lock"}),  # Flutter/Dart
+    "flutter": frozenset({"pubspec.yaml"}),
+    "reactnative": frozenset({"app.json", "metro.config.js"}),
+    
+    # NEW: Data science and scientific computing
+    "r": frozenset({"DESCRIPTION", "NAMESPACE", ".Rproj"}),
+    "julia": frozenset({"Project.toml", "Manifest.toml"}),
+    "matlab": frozenset({"*.mlx", "*.mlapp"}),
+    
+    # NEW: Scripting languages
+    "perl": frozenset({"cpanfile", "Makefile.PL"}),
+    "lua": frozenset({"rockspec", "*.rockspec"}),
+    "bash": frozenset({"*.sh", "configure"}),
+    "powershell": frozenset({"*.ps1", "*.psm1"}),
+    
+    # NEW: Systems and low-level
+    "zig": frozenset({"build.zig", "build.zig.zon"}),
+    "nim": frozenset({"*.nimble", "config.nims"}),
+    "crystal": frozenset({"shard.yml", "shard.lock"}),
+    "v": frozenset({"v.mod"}),
+    "fortran": frozenset({"*.f90", "*.f95", "Makefile"}),
+    "assembly": frozenset({"*.asm", "*.s"}),
+    
+    # NEW: Hardware description
+    "vhdl": frozenset({"*.vhdl", "*.vhd"}),
+    "verilog": frozenset({"*.v", "*.sv"}),
+    
+    # NEW: Blockchain and smart contracts
+    "solidity": frozenset({"hardhat.config.js", "truffle-config.js", "foundry.toml"}),
+    "move": frozenset({"Move.toml"}),  # Sui/Aptos
+    "cairo": frozenset({"Scarb.toml"}),  # Starknet
+    
+    # NEW: Emerging languages
+    "gren": frozenset({"gren.json"}),
+    "roc": frozenset({"*.roc"}),
+    
+    # NEW: Markup and config
+    "latex": frozenset({"*.tex", "*.bib"}),
+    "markdown": frozenset({"*.md", "*.markdown"}),
+}
+
+# Manifest filename -> techs it signals, so detection is one lookup per file
+_MANIFEST_TO_TECHS = collections.defaultdict(list)
+for _tech, _manifests in _TECH_STACKS.items():
+    for _manifest in _manifests:
+        _MANIFEST_TO_TECHS[_manifest].append(_tech)
+_MANIFEST_TO_TECHS = {name: tuple(techs) for name, techs in _MANIFEST_TO_TECHS.items()}
+_TECH_ORDER = {tech: i for i, tech in enumerate(_TECH_STACKS)}
+_SUB_FRAMEWORKS = frozenset({"django", "flask", "react", "typescript"})
+del _tech, _manifests, _manifest
+
+# Build/metadata files shared by many ecosystems; a root hit on only these
+# doesn't settle the primary language (e.g. a Makefile over backend/requirements.txt)
+_GENERIC_MANIFESTS = frozenset({"Makefile", "configure", "CMakeLists.txt", "app.json", "DESCRIPTION"})
+# Root manifests that identify a primary language on their own
+_LANGUAGE_MANIFESTS = frozenset(
+    name for name, techs in _MANIFEST_TO_TECHS.items()
+    if name not in _GENERIC_MANIFESTS and any(tech not in _SUB_FRAMEWORKS for tech in techs)
+)
+
+_EXT_TO_TECH = {
+    # Existing
+    ".py": "python", ".js": "javascript", ".ts": "typescript",
+    ".rs": "rust", ".java": "java", ".go": "go", ".cs": "csharp",
+    ".rb": "ruby", ".php": "php", ".swift": "swift", ".kt": "kotlin",
+    ".ex": "elixir", ".exs": "elixir", ".scala": "scala", ".hs": "haskell",
+    
+    # NEW: C/C++ family
+    ".c": "c", ".h": "c",
+    ".cpp": "cpp", ".cc": "cpp", ".cxx": "cpp", ".hpp": "cpp",
+    ".mm": "objectivec",  # .m is listed under matlab below
+    
+    # NEW: Mobile/cross-platform
+    ".dart": "dart",
+    ".jsx": "react",
+    
+    # NEW: Data science
+    ".r": "r", ".R": "r",
+    ".jl": "julia",
+    ".m": "matlab",  # Conflicts with objc, check context
+    
+    # NEW: Scripting
+    ".pl": "perl", ".pm": "perl",
+    ".lua": "lua",
+    ".sh": "bash", ".bash": "bash", ".zsh": "bash",
+    ".ps1": "powershell", ".psm1": "powershell",
+    
+    # NEW: Systems/low-level
+    ".zig": "zig",
+    ".nim": "nim",
+    ".cr": "crystal",
+    ".f90": "fortran", ".f95": "fortran", ".f03": "fortran",
+    ".asm": "assembly", ".s": "assembly",
+    
+    # NEW: Hardware
+    ".vhd": "vhdl", ".vhdl": "vhdl",
+    ".v": "verilog", ".sv": "verilog",  # System Verilog (.v also used by vlang)
+    
+    # NEW: Blockchain
+    ".sol": "solidity",
+    ".move": "move",
+    ".cairo": "cairo",
+    
+    # NEW: Other
+    ".tex": "latex",
+    ".md": "markdown", ".markdown": "markdown",
+}
+
+def _detect_from_manifests(repo_path: str, key_file_set: set) -> List[str]:
+    """
+    Stack from manifest files (plus sub-frameworks), in _TECH_STACKS order
+    """
+    stack = []
+    matched = {tech for f in key_file_set for tech in _MANIFEST_TO_TECHS.get(f, ())}
+    for tech in sorted(matched, key=_TECH_ORDER.__getitem__):
+        if tech in _SUB_FRAMEWORKS:
             continue  # Handle these as sub-frameworks below
             
-        if any(f in key_files for f in manifest_files):
-            stack.append(tech)
-            
-            # Handle sub-frameworks
-            if tech == "python":
-                if any(f in key_files for f in TECH_STACKS["django"]):
-                    stack.append("django")
-                elif any(f in key_files for f in TECH_STACKS["flask"]):
-                    stack.append("flask")
-                    
-            elif tech == "javascript":
-                # Check for React in package.json
+        stack.append(tech)
+        
+        # Handle sub-frameworks
+        if tech == "python":
+            if "django" in matched:
+                stack.append("django")
+            elif "flask" in matched:
+                stack.append("flask")
+                
+        elif tech == "javascript":
+            # Check for React/TypeScript in package.json (raw bytes; no need to parse)
+            package_blob = b""
+            try:
+                with open(os.path.join(repo_path, "package.json"), 'rb') as f:
+                    package_blob = f.read().lower()
+            except OSError:
+                # Fallback if package.json can't be read
+                pass
+            if b'react' in package_blob:
+                stack.append("react")
+            if b'typescript' in package_blob or "typescript" in matched:
+                stack.append("typescript")
+                
+        elif tech == "java":
+            # Check for Kotlin in build.gradle
+            if "build.gradle.kts" in key_file_set:
+                stack.append("kotlin")
+    
+    return stack
+
+def _detect_from_root(repo_path: str) -> Tuple[List[str], set]:
+    """
+    Manifest detection from a single scandir of the repo root
+    Returns (stack, root file names); stack is empty unless a language-specific
+    manifest is present, since generic build files alone need the deep scan
+    """
+    root_files = set()
+    try:
+        with os.scandir(repo_path) as entries:
+            for entry in entries:
                 try:
-                    package_json_path = os.path.join(repo_path, "package.json")
-                    if os.path.exists(package_json_path):
-                        with open(package_json_path, 'r', encoding='utf-8') as f:
-                            package_data = json.load(f)
-                            package_str = str(package_data).lower()
-                            if 'react' in package_str:
-                                stack.append("react")
-                            if ('typescript' in package_str or '"type": "module"' in package_str or 
-                                any(f in key_files for f in TECH_STACKS["typescript"])):
-                                stack.append("typescript")
-                except (json.JSONDecodeError, OSError, UnicodeDecodeError):
-                    # Fallback if package.json parsing fails
-                    pass
-                    
-            elif tech == "java":
-                # Check for Kotlin in build.gradle
-                if "build.gradle.kts" in key_files:
-                    stack.append("kotlin")
+                    if not entry.is_dir():
+                        root_files.add(entry.name)
+                except OSError:
+                    root_files.add(entry.name)
+    except OSError:
+        return [], root_files
+    if root_files.isdisjoint(_LANGUAGE_MANIFESTS):
+        return [], root_files
+    return _detect_from_manifests(repo_path, root_files), root_files
+
+def _detect_from_deep_scan(repo_path: str) -> Tuple[List[str], set]:
+    """
+    Fallback for repos without root manifests: scan the top 2 levels
+    Returns (stack, file names seen)
+    """
+    key_files = set()
+    file_extensions = collections.defaultdict(int)
+    
+    for name, is_file in _shallow_scan(repo_path):
+        if not is_file:
+            continue
+        key_files.add(name)
+        _, ext = os.path.splitext(name)
+        if ext:
+            file_extensions[ext.lower()] += 1
+    
+    stack = _detect_from_manifests(repo_path, key_files)
     
     # Fallback: detect by file extensions if no manifest files found
     if not stack:
-        ext_map = {
-            # Existing
-            ".py": "python", ".js": "javascript", ".ts": "typescript",
-            ".rs": "rust", ".java": "java", ".go": "go", ".cs": "csharp",
-            ".rb": "ruby", ".php": "php", ".swift": "swift", ".kt": "kotlin",
-            ".ex": "elixir", ".exs": "elixir", ".scala": "scala", ".hs": "haskell",
-            
-            # NEW: C/C++ family
-            ".c": "c", ".h": "c",
-            ".cpp": "cpp", ".cc": "cpp", ".cxx": "cpp", ".hpp": "cpp",
-            ".m": "objectivec", ".mm": "objectivec",
-            
-            # NEW: Mobile/cross-platform
-            ".dart": "dart",
-            ".jsx": "react",
-            
-            # NEW: Data science
-            ".r": "r", ".R": "r",
-            ".jl": "julia",
-            ".m": "matlab",  # Conflicts with objc, check context
-            
-            # NEW: Scripting
-            ".pl": "perl", ".pm": "perl",
-            ".lua": "lua",
-            ".sh": "bash", ".bash": "bash", ".zsh": "bash",
-            ".ps1": "powershell", ".psm1": "powershell",
-            
-            # NEW: Systems/low-level
-            ".zig": "zig",
-            ".nim": "nim",
-            ".cr": "crystal",
-            ".v": "v",
-            ".f90": "fortran", ".f95": "fortran", ".f03": "fortran",
-            ".asm": "assembly", ".s": "assembly",
-            
-            # NEW: Hardware
-            ".vhd": "vhdl", ".vhdl": "vhdl",
-            ".v": "verilog", ".sv": "verilog",  # System Verilog
-            
-            # NEW: Blockchain
-            ".sol": "solidity",
-            ".move": "move",
-            ".cairo": "cairo",
-            
-            # NEW: Other
-            ".tex": "latex",
-            ".md": "markdown", ".markdown": "markdown",
-        }
-        
         for ext, count in file_extensions.items():
-            if count > 5 and ext in ext_map:
-                tech = ext_map[ext]
+            if count > 5 and ext in _EXT_TO_TECH:
+                tech = _EXT_TO_TECH[ext]
                 if tech not in stack:
                     stack.append(tech)
+    
+    return stack, key_files
+
+@_cache_per_head
+def detect_tech_stack(repo_path: str) -> List[str]:
+    """
+    Detect tech stack based on project files
+    Checks the repo root first and only scans 2 levels deep when it has no
+    language-specific manifest (the deep scan also covers the root's files)
+    Returns list of 1-3 tech stack identifiers
+    Supports 30+ programming languages and frameworks
+    """
+    stack, key_files = _detect_from_root(repo_path)
+    if not stack:
+        stack, key_files = _detect_from_deep_scan(repo_path)
         
     # CLI/Tool detection
     if any(f in key_files for f in ["cli.py", "main.py", "__main__.py"]) or "bin/" in key_files:
@@ -221,6 +391,7 @@ def detect_tech_stack(repo_path: str) -> List[str]:
         
     return stack[:3]  # Limit to top 3 stack items
 
+@_cache_per_head
 def analyze_project_structure(repo_path: str) -> Dict[str, Any]:
     """
     Analyze project structure (shallow scan for performance)
@@ -253,14 +424,38 @@ def analyze_project_structure(repo_path: str) -> Dict[str, Any]:
         "has_tests_dir": has_tests_dir
     }
 
-def analyze_commit_style(repo_path: str, limit: int = 50) -> Dict[str, Any]:
+def _collect_repo_git_data(repo_path: str, limit: int = 50) -> Tuple[List[str], Optional[str]]:
+    """
+    Fetch recent commit subjects and the current branch with a single git log
+    Returns (messages, branch); branch is None when HEAD is detached or unborn
+    """
+    log_output = run_git(["log", f"-{limit}", "-z", "--format=%D%x1f%s"], repo_path)
+    if not log_output:
+        return [], None
+    
+    messages = []
+    branch = None
+    for i, record in enumerate(log_output.rstrip('\x00').split('\x00')):
+        refs, _, message = record.partition('\x1f')
+        if i == 0:
+            # First commit is HEAD; its decoration reads "HEAD -> branch, ..."
+            for ref in refs.split(', '):
+                if ref.startswith('HEAD -> '):
+                    branch = ref[len('HEAD -> '):]
+                    break
+        messages.append(message)
+    return messages, branch
+
+def analyze_commit_style(repo_path: str, limit: int = 50, messages: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Analyze commit message patterns from recent history
+    Pass pre-fetched commit subjects as messages to skip the git call
     Returns style analysis with fallbacks for empty repos
     """
-    log_output = run_git(["log", f"-{limit}", "--oneline"], repo_path)
+    if messages is None:
+        messages, _ = _collect_repo_git_data(repo_path, limit)
     
-    if not log_output:
+    if not messages:
         # Fallback for empty repos or git issues
         return {
             "avg_length": 5.0,
@@ -270,43 +465,39 @@ def analyze_commit_style(repo_path: str, limit: int = 50) -> Dict[str, Any]:
             "freeform_ratio": 1.0  # Default to freeform for empty repos
         }
     
-    messages = []
     prefixes = []
     prefixed_commits = 0
     total_commits = 0
+    total_words = 0
     emoji_count = 0
     case_patterns = {"sentence": 0, "lowercase": 0, "imperative": 0}
     
-    # Regex patterns
-    prefix_pattern = re.compile(r'^[a-f0-9]+\s+([a-z]+:)', re.IGNORECASE)
-    emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+')
-    imperative_keywords = ['add', 'fix', 'update', 'remove', 'refactor', 'implement', 'create', 'delete']
+    imperative_keywords = {'add', 'fix', 'update', 'remove', 'refactor', 'implement', 'create', 'delete'}
     
-    for line in log_output.split('\n'):
-        if not line.strip():
+    # Single pass: every per-message statistic is accumulated here
+    for line in messages:
+        message = line.strip()
+        if not message:
             continue
             
-        # Extract commit message (skip hash)
-        parts = line.split(' ', 1)
-        if len(parts) < 2:
-            continue
-            
-        message = parts[1].strip()
-        messages.append(message)
+        words = message.split()
         total_commits += 1
+        total_words += len(words)
         
         # Check for emoji
-        if emoji_pattern.search(message):
+        if _has_emoji(message):
             emoji_count += 1
             
-        # Extract prefix for freeform calculation
-        prefix_match = prefix_pattern.match(line)
-        if prefix_match:
-            prefixes.append(prefix_match.group(1).lower())
-            prefixed_commits += 1
+        # Extract prefix ("feat:", "Fix:", ...) for freeform calculation
+        colon_idx = message.find(':')
+        if colon_idx > 0:
+            prefix = message[:colon_idx]
+            if prefix.isascii() and prefix.isalpha():
+                prefixes.append(prefix.lower())
+                prefixed_commits += 1
         
         # Analyze case style
-        first_word = message.split()[0] if message.split() else ""
+        first_word = words[0]
         if first_word:
             if first_word.lower() in imperative_keywords:
                 case_patterns["imperative"] += 1
@@ -316,10 +507,10 @@ def analyze_commit_style(repo_path: str, limit: int = 50) -> Dict[str, Any]:
                 case_patterns["lowercase"] += 1
     
     # Calculate averages and patterns
-    avg_length = sum(len(msg.split()) for msg in messages) / len(messages) if messages else 5.0
+    avg_length = total_words / total_commits if total_commits else 5.0
     prefix_counter = collections.Counter(prefixes)
     common_prefixes = [prefix + ":" for prefix, count in prefix_counter.most_common(3)]
-    uses_emoji = (emoji_count / len(messages)) > 0.2 if messages else False
+    uses_emoji = (emoji_count / total_commits) > 0.2 if total_commits else False
     
     # Calculate freeform ratio (1.0 = fully freeform, 0.0 = fully prefixed)
     freeform_ratio = 1.0 - (prefixed_commits / total_commits) if total_commits > 0 else 1.0
@@ -335,11 +526,12 @@ def analyze_commit_style(repo_path: str, limit: int = 50) -> Dict[str, Any]:
         "freeform_ratio": round(freeform_ratio, 2)
     }
 
-def get_repo_habits(repo_path: str) -> Dict[str, str]:
+def get_repo_habits(repo_path: str, branch: Optional[str] = None) -> Dict[str, str]:
     """
     Analyze repository habits (default branch, etc.)
+    Pass an already-known branch to skip the git calls
     """
-    default_branch = run_git(["symbolic-ref", "--short", "HEAD"], repo_path)
+    default_branch = branch or run_git(["symbolic-ref", "--short", "HEAD"], repo_path)
     if not default_branch:
         # Fallback: try to get main branch name
         default_branch = run_git(["rev-parse", "--abbrev-ref", "HEAD"], repo_path)
@@ -350,6 +542,35 @@ def get_repo_habits(repo_path: str) -> Dict[str, str]:
         "default_branch": default_branch
     }
 
+_MAX_PROFILE_REPOS = 10
+_MAX_PROFILE_WORKERS = 8
+
+def _iter_repo_roots(dev_paths: List[str]):
+    """
+    Yield git repo roots under dev paths without descending into repos
+    """
+    for base_path in dev_paths:
+        if not base_path or not os.path.exists(base_path):
+            continue
+            
+        yield from _find_git_repos(base_path)
+
+def _analyze_one_repo(root: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the profile entry for one repo; None if the repo can't be read
+    """
+    try:
+        messages, branch = _collect_repo_git_data(root)
+        return {
+            "path": root,
+            "tech_stack": detect_tech_stack(root),
+            "structure": analyze_project_structure(root),
+            "commit_style": analyze_commit_style(root, messages=messages),
+            "habits": get_repo_habits(root, branch)
+        }
+    except (OSError, subprocess.SubprocessError):
+        return None
+
 def build_profile(dev_paths: List[str]) -> Dict[str, Any]:
     """
     Build user profile by scanning repositories in dev paths
@@ -364,67 +585,41 @@ def build_profile(dev_paths: List[str]) -> Dict[str, Any]:
         "case_counts": collections.defaultdict(int)
     }
     
-    scanned_repos = []
+    # Pick up to 10 distinct repos (by name) before doing any heavy analysis
+    roots = []
+    seen_names = set()
+    for root in _iter_repo_roots(dev_paths):
+        repo_name = _resolve_repo_name(root)
+        if repo_name in seen_names:
+            continue
+        seen_names.add(repo_name)
+        roots.append((repo_name, root))
+        
+        # Limit to prevent performance issues
+        if len(roots) >= _MAX_PROFILE_REPOS:
+            break
+    
+    # Analyze repos concurrently; the work is dominated by git subprocesses
+    if roots:
+        with ThreadPoolExecutor(max_workers=min(_MAX_PROFILE_WORKERS, len(roots))) as executor:
+            results = list(executor.map(_analyze_one_repo, [root for _, root in roots]))
+    else:
+        results = []
     
-    # Find repos using existing path detector logic
-    for base_path in dev_paths:
-        if not base_path or not os.path.exists(base_path):
+    for (repo_name, _), repo_profile in zip(roots, results):
+        if repo_profile is None:
+            # Skip repos that caused issues
             continue
-            
-        for root, dirs, files in os.walk(base_path):
-            if '.git' in dirs:
-                try:
-                    # Get repo name (prefer remote name)
-                    repo_name = os.path.basename(root)
-                    remote_url = run_git(["config", "--get", "remote.origin.url"], root)
-                    
-                    if remote_url:
-                        if remote_url.endswith('.git'):
-                            remote_url = remote_url[:-4]
-                        repo_name = remote_url.split('/')[-1]
-                    
-                    # Skip if we already processed this repo (by name)
-                    if repo_name in repos:
-                        dirs.clear()
-                        continue
-                    
-                    # Analyze repo
-                    commit_style = analyze_commit_style(root)
-                    tech_stack = detect_tech_stack(root)
-                    structure = analyze_project_structure(root)
-                    habits = get_repo_habits(root)
-                    
-                    # Store repo profile
-                    repos[repo_name] = {
-                        "path": root,
-                        "tech_stack": tech_stack,
-                        "structure": structure,
-                        "commit_style": commit_style,
-                        "habits": habits
-                    }
-                    
-                    # Aggregate global stats
-                    global_stats["total_length"] += commit_style["avg_length"]
-                    global_stats["total_messages"] += 1
-                    global_stats["all_prefixes"].extend(commit_style["common_prefixes"])
-                    if commit_style["uses_emoji"]:
-                        global_stats["emoji_repos"] += 1
-                    global_stats["case_counts"][commit_style["case_style"]] += 1
-                    
-                    scanned_repos.append(repo_name)
-                    
-                    # Limit to prevent performance issues
-                    if len(scanned_repos) >= 10:
-                        break
-                        
-                except (OSError, subprocess.SubprocessError):
-                    # Skip repos that cause issues
-                    continue
-                    
-                dirs.clear()  # Don't scan nested repos
-            
-            if len(scanned_repos) >= 10:
-                break
+        repos[repo_name] = repo_profile
+        commit_style = repo_profile["commit_style"]
+        
+        # Aggregate global stats
+        global_stats["total_length"] += commit_style["avg_length"]
+        global_stats["total_messages"] += 1
+        global_stats["all_prefixes"].extend(commit_style["common_prefixes"])
+        if commit_style["uses_emoji"]:
+            global_stats["emoji_repos"] += 1
+        global_stats["case_counts"][commit_style["case_style"]] += 1
     
     # Calculate global aggregates
     if global_stats["total_messages"] > 0:
@@ -458,12 +653,7 @@ def suggest_commit_message(repo_path: str, profile: Dict[str, Any], current_mess
     suggestions = []
     
     # Get repo name for profile lookup
-    repo_name = os.path.basename(repo_path)
-    remote_url = run_git(["config", "--get", "remote.origin.url"], repo_path)
-    if remote_url:
-        if remote_url.endswith('.git'):
-            remote_url = remote_url[:-4]
-        repo_name = remote_url.split('/')[-1]
+    repo_name = _resolve_repo_name(repo_path)
     
     repo_profile = profile.get("repos", {}).get(repo_name, {})
     global_profile = profile.get("global", {})
@@ -523,9 +713,8 @@ def suggest_commit_message(repo_path: str, profile: Dict[str, Any], current_mess
         
         # Emoji suggestions
         uses_emoji = repo_style.get("uses_emoji", global_profile.get("uses_emoji", False))
-        emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+')
         
-        if uses_emoji and not emoji_pattern.search(current_message):
+        if uses_emoji and not _has_emoji(current_message):
             suggestions.append("💡 Add an emoji? 😎")
     
     # Length suggestions (apply to both styles)
@@ -543,12 +732,7 @@ def get_stack_suggestions(repo_path: str, profile: Dict[str, Any]) -> List[str]:
     suggestions = []
     
     # Get repo name and profile
-    repo_name = os.path.basename(repo_path)
-    remote_url = run_git(["config", "--get", "remote.origin.url"], repo_path)
-    if remote_url:
-        if remote_url.endswith('.git'):
-            remote_url = remote_url[:-4]
-        repo_name = remote_url.split('/')[-1]
+    repo_name = _resolve_repo_name(repo_path)
     
     repo_profile = profile.get("repos", {}).get(repo_name, {})
     tech_stack = repo_profile.get("tech_stack", [])
@@ -562,14 +746,17 @@ def get_stack_suggestions(repo_path: str, profile: Dict[str, Any]) -> List[str]:
         return suggestions
     
     changed_list = changed_files.split('\n')
+    # Summarize once so each check below is a set lookup, not a list scan
+    changed_set = set(changed_list)
+    changed_exts = {os.path.splitext(f)[1] for f in changed_list}
     
     # Stack-specific suggestions
     if "javascript" in tech_stack or "react" in tech_stack:
-        if "package.json" in changed_list and "package-lock.json" not in changed_list:
+        if "package.json" in changed_set and "package-lock.json" not in changed_set:
             suggestions.append("💡 JavaScript/React: Run 'npm install' to update lockfile?")
     
     if "typescript" in tech_stack:
-        if any(f.endswith('.ts') for f in changed_list):
+        if '.ts' in changed_exts:
             suggestions.append("💡 TypeScript: Run 'tsc' to compile?")
     
     if "python" in tech_stack:
@@ -577,35 +764,35 @@ def get_stack_suggestions(repo_path: str, profile: Dict[str, Any]) -> List[str]:
             if any("models.py" in f for f in changed_list) and not any("migrations/" in f for f in changed_list):
                 suggestions.append("💡 Django: Run 'python manage.py makemigrations'?")
         
-        if "requirements.txt" in changed_list or "setup.py" in changed_list:
+        if "requirements.txt" in changed_set or "setup.py" in changed_set:
             suggestions.append("💡 Python: Update virtual environment with new dependencies?")
     
     if "rust" in tech_stack:
-        if "Cargo.toml" in changed_list and "Cargo.lock" not in changed_list:
+        if "Cargo.toml" in changed_set and "Cargo.lock" not in changed_set:
             suggestions.append("💡 Rust: Run 'cargo check' to update Cargo.lock?")
     
     if "php" in tech_stack:
-        if "composer.json" in changed_list and "composer.lock" not in changed_list:
+        if "composer.json" in changed_set and "composer.lock" not in changed_set:
             suggestions.append("💡 PHP: Run 'composer install' for lockfile?")
     
     if "swift" in tech_stack:
-        if "Podfile" in changed_list:
+        if "Podfile" in changed_set:
             suggestions.append("💡 Swift: Update pods?")
     
     if "kotlin" in tech_stack:
-        if "build.gradle" in changed_list or "build.gradle.kts" in changed_list:
+        if "build.gradle" in changed_set or "build.gradle.kts" in changed_set:
             suggestions.append("💡 Kotlin: Gradle sync?")
     
     if "elixir" in tech_stack:
-        if "mix.exs" in changed_list:
+        if "mix.exs" in changed_set:
             suggestions.append("💡 Elixir: Run 'mix deps.get'?")
     
     if "scala" in tech_stack:
-        if "build.sbt" in changed_list:
+        if "build.sbt" in changed_set:
             suggestions.append("💡 Scala: SBT reload?")
     
     if "haskell" in tech_stack:
-        if "cabal.project" in changed_list or "package.yaml" in changed_list:
+        if "cabal.project" in changed_set or "package.yaml" in changed_set:
             suggestions.append("💡 Haskell: Cabal update?")
     
     return suggestions
@@ -618,12 +805,7 @@ def get_structure_suggestions(repo_path: str, profile: Dict[str, Any]) -> List[s
     suggestions = []
     
     # Get repo name and profile
-    repo_name = os.path.basename(repo_path)
-    remote_url = run_git(["config", "--get", "remote.origin.url"], repo_path)
-    if remote_url:
-        if remote_url.endswith('.git'):
-            remote_url = remote_url[:-4]
-        repo_name = remote_url.split('/')[-1]
+    repo_name = _resolve_repo_name(repo_path)
     
     repo_profile = profile.get("repos", {}).get(repo_name, {})
     structure = repo_profile.get("structure", {})
@@ -679,13 +861,13 @@ def get_commit_size_suggestions(repo_path: str) -> List[str]:
         
         # Extract number of files changed
         if "file" in summary_line:
-            files_match = re.search(r'(\d+)\s+file', summary_line)
+            files_match = _FILES_RE.search(summary_line)
             if files_match:
                 files_changed = int(files_match.group(1))
         
         # Extract lines changed (insertions + deletions)
-        insertions_match = re.search(r'(\d+)\s+insertion', summary_line)
-        deletions_match = re.search(r'(\d+)\s+deletion', summary_line)
+        insertions_match = _INS_RE.search(summary_line)
+        deletions_match = _DEL_RE.search(summary_line)
         
         if insertions_match:
             lines_changed += int(insertions_match.group(1))
@@ -718,12 +900,7 @@ def get_til_tag_suggestions(repo_path: str, profile: Dict[str, Any], til_title:
     
     try:
         # Get repo name and profile
-        repo_name = os.path.basename(repo_path)
-        remote_url = run_git(["config", "--get", "remote.origin.url"], repo_path)
-        if remote_url:
-            if remote_url.endswith('.git'):
-                remote_url = remote_url[:-4]
-            repo_name = remote_url.split('/')[-1]
+        repo_name = _resolve_repo_name(repo_path)
         
         repo_profile = profile.get("repos", {}).get(repo_name, {})
         tech_stack = repo_profile.get("tech_stack", [])
@@ -770,12 +947,7 @@ def update_freeform_feedback(profile: Dict[str, Any], repo_path: str, feedback:
     Returns updated profile
     """
     # Get repo name
-    repo_name = os.path.basename(repo_path)
-    remote_url = run_git(["config", "--get", "remote.origin.url"], repo_path)
-    if remote_url:
-        if remote_url.endswith('.git'):
-            remote_url = remote_url[:-4]
-        repo_name = remote_url.split('/')[-1]
+    repo_name = _resolve_repo_name(repo_path)
     
     # Update freeform ratio based on feedback
     if repo_name in profile.get("repos", {}):
@@ -8,7 +8,8 @@ setup(
     packages=find_packages(),
     install_requires=["requests", "colorama", "packaging", "textual", "plotext", "markdown"],
     extras_require={
-        "ai": ["transformers>=4.30.0", "torch>=2.0.0"]
+        "ai": ["transformers>=4.30.0", "torch>=2.0.0"],
+        "speed": ["orjson>=3.8"]
     },
     entry_points={
         "console_scripts": [